@@ -5,8 +5,15 @@ Handles camera initialization, frame capture, and resolution management
 with fallback support for different camera configurations.
 """
 
+import os
+import sys
+import glob
+import json
 import logging
-from typing import Tuple, Optional, List
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Tuple, Optional, List
 import cv2
 import numpy as np
 
@@ -15,27 +22,51 @@ from config import (
     CAMERA_WIDTH,
     CAMERA_HEIGHT,
     CAMERA_FALLBACK_WIDTHS,
-    CAMERA_FALLBACK_HEIGHTS
+    CAMERA_FALLBACK_HEIGHTS,
+    CAMERA_READ_TIMEOUT,
+    CAMERA_CACHE_FILE,
+    CAMERA_FOURCC,
+    AUTO_SAVE_DIR
 )
 
 logger = logging.getLogger(__name__)
 
+# Bound OpenCV's worker pool so it does not oversubscribe the cores
+# MediaPipe's inference threads are running on
+cv2.setNumThreads(max(1, (os.cpu_count() or 2) // 2))
+
 
 class CameraManager:
     """Manages camera operations with fallback support."""
     
-    def __init__(self, camera_index: int = CAMERA_INDEX):
+    def __init__(self, camera_index: int = CAMERA_INDEX, cache_dir: Optional[str] = None):
         """
         Initialize the camera manager.
         
         Args:
             camera_index: Index of camera to use.
+            cache_dir: Directory for the camera settings cache.
+                Defaults to the auto-save directory next to this script.
         """
         self.camera_index = camera_index
+        cache_base = Path(cache_dir) if cache_dir else Path(__file__).parent.absolute() / AUTO_SAVE_DIR
+        self._cache_path = cache_base / CAMERA_CACHE_FILE
         self.cap: Optional[cv2.VideoCapture] = None
         self.width: int = 0
         self.height: int = 0
         self._is_initialized: bool = False
+        
+        # When set, the reader only advances the stream without decoding
+        self.skip_decode: bool = False
+        
+        # Latest-frame slot filled by the reader thread. A deque with
+        # maxlen=1 gives atomic overwrite (append) and hand-off (popleft)
+        # between the single producer and single consumer without a lock.
+        self._slot: deque = deque(maxlen=1)
+        self._frame_event = threading.Event()
+        self._reader_failed: bool = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
     
     def initialize(self) -> bool:
         """
@@ -48,8 +79,8 @@ class CameraManager:
         self.cap = cv2.VideoCapture(self.camera_index)
         
         if not self.cap.isOpened():
-            # Try alternative camera indices
-            for alt_index in range(4):
+            # Try alternative camera indices, only probing devices that exist
+            for alt_index in self._candidate_indices():
                 if alt_index == self.camera_index:
                     continue
                 logger.info(f"Trying camera index {alt_index}...")
@@ -62,6 +93,12 @@ class CameraManager:
             logger.error("Could not open any camera")
             return False
         
+        # Request compressed frames before negotiating the resolution;
+        # MJPEG lets most USB webcams reach higher frame rates than
+        # their raw YUY2 default
+        if CAMERA_FOURCC:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*CAMERA_FOURCC))
+        
         # Try to set preferred resolution with fallback
         self._set_resolution_with_fallback()
         
@@ -72,9 +109,110 @@ class CameraManager:
         logger.info(f"Camera initialized: index={self.camera_index}, "
                    f"resolution={self.width}x{self.height}")
         
+        cache = self._load_cache()
+        if cache.get("last_index") != self.camera_index:
+            cache["last_index"] = self.camera_index
+            self._save_cache(cache)
+        
+        # Keep the driver queue short so the reader never falls behind.
+        # Not every backend supports this; the reader thread still drops
+        # stale frames on those, but each one costs a read.
+        if not self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            logger.debug("Camera backend ignored CAP_PROP_BUFFERSIZE; "
+                         "stale frames are dropped by the reader thread")
+        
         self._is_initialized = True
+        self._start_reader()
         return True
     
+    def _candidate_indices(self) -> List[int]:
+        """
+        List camera indices worth probing, most likely first.
+        
+        On Linux only indices with a /dev/videoN node are returned, since
+        every failed VideoCapture() open can take hundreds of milliseconds.
+        The index that worked on the previous launch is tried first.
+        
+        Returns:
+            Camera indices to try.
+        """
+        candidates = list(range(4))
+        
+        if sys.platform.startswith("linux"):
+            found = []
+            for path in glob.glob("/dev/video*"):
+                suffix = path[len("/dev/video"):]
+                if suffix.isdigit():
+                    found.append(int(suffix))
+            candidates = sorted(found)
+        
+        last_index = self._load_cache().get("last_index")
+        if isinstance(last_index, int) and last_index in candidates:
+            candidates.remove(last_index)
+            candidates.insert(0, last_index)
+        
+        return candidates
+    
+    def _start_reader(self) -> None:
+        """Start the background thread that keeps the latest frame slot fresh."""
+        self._stop.clear()
+        self._slot.clear()
+        self._reader_failed = False
+        self._thread = threading.Thread(
+            target=self._reader,
+            name="CameraReader",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def _reader(self) -> None:
+        """
+        Continuously read frames into the single-slot buffer.
+        
+        Older unread frames are overwritten so the consumer always gets
+        the most recent image instead of whatever is queued in the driver.
+        """
+        while not self._stop.is_set():
+            if not self.grab():
+                self._reader_failed = True
+                self._frame_event.set()
+                logger.warning("Camera reader stopped: frame grab failed")
+                break
+            
+            # Frames nobody will look at are never decoded
+            if self.skip_decode:
+                continue
+            
+            ret, frame = self.retrieve()
+            if not ret:
+                continue
+            
+            self._slot.append(frame)
+            # Only wake the consumer if it may be waiting
+            if not self._frame_event.is_set():
+                self._frame_event.set()
+    
+    def grab(self) -> bool:
+        """
+        Advance the stream to the next frame without decoding it.
+        
+        Returns:
+            True if a frame was grabbed.
+        """
+        return self.cap.grab()
+    
+    def retrieve(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Decode the most recently grabbed frame.
+        
+        Returns:
+            Tuple of (success, frame).
+        """
+        ret, frame = self.cap.retrieve()
+        if not ret or frame is None:
+            return False, None
+        return True, frame
+    
     def _set_resolution_with_fallback(self) -> Tuple[int, int]:
         """
         Try to set camera resolution with fallback options.
@@ -89,6 +227,20 @@ class CameraManager:
         if preferred not in resolutions:
             resolutions.insert(0, preferred)
         
+        # Try the resolution that worked last time before anything else,
+        # skipping the renegotiations that are known to fail
+        cache = self._load_cache()
+        cached = cache.get(str(self.camera_index))
+        try:
+            cached = (int(cached[0]), int(cached[1]))
+        except (TypeError, ValueError, IndexError):
+            cached = None
+        
+        if cached is not None:
+            if cached in resolutions:
+                resolutions.remove(cached)
+            resolutions.insert(0, cached)
+        
         for width, height in resolutions:
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
@@ -99,6 +251,9 @@ class CameraManager:
             
             if actual_width == width and actual_height == height:
                 logger.debug(f"Resolution set to {width}x{height}")
+                if cached != (width, height):
+                    cache[str(self.camera_index)] = [width, height]
+                    self._save_cache(cache)
                 return (width, height)
         
         # Return whatever resolution the camera defaulted to
@@ -107,9 +262,72 @@ class CameraManager:
         logger.warning(f"Using camera default resolution: {actual_width}x{actual_height}")
         return (actual_width, actual_height)
     
+    def _load_cache(self) -> Dict[str, object]:
+        """
+        Load cached camera settings.
+        
+        Returns:
+            Mapping of camera index (as string) to [width, height], plus
+            'last_index' for the camera that opened last time.
+        """
+        try:
+            with open(self._cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable camera cache {self._cache_path}: {e}")
+            return {}
+    
+    def _save_cache(self, cache: Dict[str, object]) -> None:
+        """
+        Persist camera settings for the next launch.
+        
+        Args:
+            cache: Settings in the format returned by _load_cache().
+        """
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._cache_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+        except OSError as e:
+            logger.warning(f"Failed to write camera cache {self._cache_path}: {e}")
+    
+    def _take_frame(self) -> Optional[np.ndarray]:
+        """
+        Take the latest unread frame out of the slot.
+        
+        Returns:
+            The frame, or None if the reader failed or timed out.
+        """
+        try:
+            return self._slot.popleft()
+        except IndexError:
+            pass
+        
+        # Clear before re-checking so a frame published in between
+        # still wakes the wait below
+        self._frame_event.clear()
+        try:
+            return self._slot.popleft()
+        except IndexError:
+            pass
+        
+        if self._reader_failed or not self._frame_event.wait(CAMERA_READ_TIMEOUT):
+            return None
+        
+        try:
+            return self._slot.popleft()
+        except IndexError:
+            return None
+    
     def read_frame(self, flip: bool = True) -> Tuple[bool, Optional[np.ndarray]]:
         """
-        Read a frame from the camera.
+        Read the most recent frame from the camera.
+        
+        Returns as soon as a frame newer than the last one handed out is
+        available, waiting at most CAMERA_READ_TIMEOUT seconds.
         
         Args:
             flip: Whether to flip the frame horizontally (mirror).
@@ -120,13 +338,13 @@ class CameraManager:
         if not self._is_initialized or self.cap is None:
             return False, None
         
-        ret, frame = self.cap.read()
-        
-        if not ret or frame is None:
+        frame = self._take_frame()
+        if frame is None:
             return False, None
         
+        # The slot hands over ownership of the frame, so mirror it in place
         if flip:
-            frame = cv2.flip(frame, 1)
+            cv2.flip(frame, 1, dst=frame)
         
         return True, frame
     
@@ -145,6 +363,11 @@ class CameraManager:
     
     def release(self) -> None:
         """Release camera resources."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=CAMERA_READ_TIMEOUT)
+            self._thread = None
+        
         if self.cap is not None:
             self.cap.release()
             self.cap = None
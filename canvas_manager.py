@@ -8,7 +8,7 @@ and history management (undo/redo).
 import math
 import logging
 from collections import deque
-from typing import Tuple, Optional, List
+from typing import Callable, Tuple, Optional
 import cv2
 import numpy as np
 
@@ -16,8 +16,8 @@ from config import (
     BRUSH_SIZES,
     DEFAULT_BRUSH_INDEX,
     ERASER_THICKNESS,
-    ERASER_COLOR,
-    COLORS,
+    COLOR_NAMES,
+    COLOR_LIST,
     DEFAULT_COLOR_INDEX,
     AVAILABLE_SHAPES,
     DEFAULT_SHAPE,
@@ -30,6 +30,13 @@ from config import (
 
 logger = logging.getLogger(__name__)
 
+# ARROW_HEAD_ANGLE is fixed, so its cos/sin are computed once at import
+_ARROW_COS: float = math.cos(ARROW_HEAD_ANGLE)
+_ARROW_SIN: float = math.sin(ARROW_HEAD_ANGLE)
+
+# Canvas value of pixels without ink; palette color i is stored as i + 1
+BLANK_INK: int = 0
+
 
 class CanvasManager:
     """Manages the drawing canvas and related operations."""
@@ -45,18 +52,22 @@ class CanvasManager:
         self.width = width
         self.height = height
         
-        # Initialize canvas
-        self.canvas: np.ndarray = np.zeros((height, width, 3), dtype=np.uint8)
+        # Initialize canvas. It holds one palette index per pixel rather
+        # than BGR, a third of the memory to draw into, snapshot and blend;
+        # palette_lut maps it back to BGR.
+        self.canvas: np.ndarray = np.zeros((height, width), dtype=np.uint8)
+        self.palette_lut: np.ndarray = np.zeros((256, 3), dtype=np.uint8)
+        self.palette_lut[BLANK_INK + 1:BLANK_INK + 1 + len(COLOR_LIST)] = COLOR_LIST
         
         # Drawing state
-        self.prev_x: int = 0
-        self.prev_y: int = 0
+        self.prev_point: Optional[Tuple[int, int]] = None  # None until a stroke starts
         
         # Color settings
-        self.color_names: List[str] = list(COLORS.keys())
+        self.color_names: Tuple[str, ...] = COLOR_NAMES
+        self._color_values: Tuple[Tuple[int, int, int], ...] = COLOR_LIST
         self.current_color_index: int = DEFAULT_COLOR_INDEX
-        self.current_color: Tuple[int, int, int] = COLORS[self.color_names[self.current_color_index]]
-        self.eraser_color: Tuple[int, int, int] = ERASER_COLOR
+        self.current_color: Tuple[int, int, int] = self._color_values[self.current_color_index]
+        self.current_ink: int = BLANK_INK + 1 + self.current_color_index
         
         # Brush settings
         self.brush_sizes: Tuple[int, ...] = BRUSH_SIZES
@@ -71,28 +82,120 @@ class CanvasManager:
         
         # Trail visualization
         self.show_trail: bool = SHOW_TRAIL_DEFAULT
-        self.trail_points: deque = deque(maxlen=TRAIL_LENGTH)
-        
-        # History management using deque for O(1) operations
-        self._history: deque = deque(maxlen=MAX_HISTORY_SIZE)
-        self._history_index: int = -1
+        # Ring of the last TRAIL_LENGTH fingertip positions
+        self.trail_xy: np.ndarray = np.zeros((TRAIL_LENGTH, 2), dtype=np.int32)
+        self.trail_head: int = 0  # Total points written; next slot is head % length
+        # Oldest-first slot order of a full ring per head slot, and the
+        # buffer get_trail_points() gathers into
+        self._trail_order: np.ndarray = (
+            np.arange(TRAIL_LENGTH)[None, :] + np.arange(TRAIL_LENGTH)[:, None]
+        ) % TRAIL_LENGTH
+        self._trail_out: np.ndarray = np.empty_like(self.trail_xy)
+        
+        # draw_line(x, y) is bound to a variant specialised on show_trail
+        self.draw_line: Callable[[int, int], None]
+        self._bind_draw_line()
+        
+        # History management. Only one full copy of the current history
+        # state is kept; every other state is stored as a delta holding the
+        # pixels of the region that changed, before and after the change.
+        self._history_ref: np.ndarray = self.canvas.copy()
+        self._history: deque = deque(maxlen=MAX_HISTORY_SIZE - 1)
+        self._history_index: int = 0  # Number of deltas applied to the oldest state
+        
+        # Region (x0, y0, x1, y1) where the canvas differs from the reference
+        self._dirty: Optional[Tuple[int, int, int, int]] = None
+        
+        # Region (x0, y0, x1, y1) outside of which the canvas is known to be
+        # blank; None while nothing has been drawn since the last clear
+        self.ink_bbox: Optional[Tuple[int, int, int, int]] = None
+    
+    def _mark_dirty(
+        self,
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int,
+        pad: int,
+        adds_ink: bool = True
+    ) -> None:
+        """
+        Extend the dirty region to cover a drawing operation.
         
-        # Save initial state
-        self._save_state()
+        Args:
+            x0, y0: First corner of the affected area.
+            x1, y1: Opposite corner of the affected area.
+            pad: Extra margin, e.g. for line thickness.
+            adds_ink: Whether the operation may leave non-blank pixels,
+                in which case the ink region is extended as well.
+        """
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if y0 > y1:
+            y0, y1 = y1, y0
+        
+        x0 = max(x0 - pad, 0)
+        y0 = max(y0 - pad, 0)
+        x1 = min(x1 + pad + 1, self.width)
+        y1 = min(y1 + pad + 1, self.height)
+        
+        if x0 >= x1 or y0 >= y1:
+            return
+        
+        self._dirty = self._union_bbox(self._dirty, (x0, y0, x1, y1))
+        if adds_ink:
+            self.ink_bbox = self._union_bbox(self.ink_bbox, (x0, y0, x1, y1))
+    
+    @staticmethod
+    def _union_bbox(
+        a: Optional[Tuple[int, int, int, int]],
+        b: Tuple[int, int, int, int]
+    ) -> Tuple[int, int, int, int]:
+        """Return the smallest (x0, y0, x1, y1) box covering both a and b."""
+        if a is None:
+            return b
+        return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+    
+    def _discard_unsaved_changes(self) -> None:
+        """Restore the dirty region of the canvas from the reference state."""
+        if self._dirty is not None:
+            x0, y0, x1, y1 = self._dirty
+            self.canvas[y0:y1, x0:x1] = self._history_ref[y0:y1, x0:x1]
+            self._dirty = None
+    
+    def _apply_delta(
+        self,
+        bbox: Optional[Tuple[int, int, int, int]],
+        pixels: Optional[np.ndarray]
+    ) -> None:
+        """Write a delta's pixels into both the reference state and the canvas."""
+        if bbox is not None:
+            x0, y0, x1, y1 = bbox
+            self._history_ref[y0:y1, x0:x1] = pixels
+            self.canvas[y0:y1, x0:x1] = pixels
+            # Undo/redo can bring back strokes from before the last clear
+            self.ink_bbox = self._union_bbox(self.ink_bbox, bbox)
     
     def _save_state(self) -> None:
         """Save current canvas state to history, clearing any redo states."""
         # If we're not at the end of history, we need to clear redo states
-        if self._history_index < len(self._history) - 1:
-            # Remove all states after current index
-            while len(self._history) > self._history_index + 1:
-                self._history.pop()
-        
-        # Add current state
-        self._history.append(self.canvas.copy())
-        self._history_index = len(self._history) - 1
-        
-        logger.debug(f"Canvas state saved. History size: {len(self._history)}")
+        for _ in range(len(self._history) - self._history_index):
+            self._history.pop()
+        
+        # Record the changed region (an empty delta if nothing changed)
+        if self._dirty is not None:
+            x0, y0, x1, y1 = self._dirty
+            before = self._history_ref[y0:y1, x0:x1].copy()
+            after = self.canvas[y0:y1, x0:x1].copy()
+            self._history_ref[y0:y1, x0:x1] = after
+            self._history.append((self._dirty, before, after))
+            self._dirty = None
+        else:
+            self._history.append((None, None, None))
+        
+        self._history_index = len(self._history)
+        
+        logger.debug(f"Canvas state saved. History size: {len(self._history) + 1}")
     
     def save_canvas_state(self) -> None:
         """Public method to save canvas state for undo."""
@@ -106,8 +209,10 @@ class CanvasManager:
             True if undo was performed, False if nothing to undo.
         """
         if self._history_index > 0:
+            self._discard_unsaved_changes()
             self._history_index -= 1
-            self.canvas = self._history[self._history_index].copy()
+            bbox, before, _ = self._history[self._history_index]
+            self._apply_delta(bbox, before)
             logger.debug(f"Undo performed. Index: {self._history_index}")
             return True
         return False
@@ -119,20 +224,58 @@ class CanvasManager:
         Returns:
             True if redo was performed, False if nothing to redo.
         """
-        if self._history_index < len(self._history) - 1:
+        if self._history_index < len(self._history):
+            self._discard_unsaved_changes()
+            bbox, _, after = self._history[self._history_index]
+            self._apply_delta(bbox, after)
             self._history_index += 1
-            self.canvas = self._history[self._history_index].copy()
             logger.debug(f"Redo performed. Index: {self._history_index}")
             return True
         return False
     
     def clear_canvas(self) -> None:
         """Clear the canvas and save state."""
-        self.canvas = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        self.canvas.fill(BLANK_INK)
+        self._mark_dirty(0, 0, self.width, self.height, 0, adds_ink=False)
+        self.ink_bbox = None
         self._save_state()
         logger.info("Canvas cleared")
     
-    def draw_line(self, x: int, y: int) -> None:
+    def _bind_draw_line(self) -> None:
+        """Point draw_line at the variant matching the current trail setting."""
+        self.draw_line = (
+            self._draw_line_with_trail if self.show_trail else self._draw_line_no_trail
+        )
+    
+    # The two draw_line variants below are specialised on show_trail so the
+    # per-frame call does not re-check it; keep their bodies in sync.
+    
+    def _draw_line_with_trail(self, x: int, y: int) -> None:
+        """
+        Draw a line from the previous position to the current position,
+        recording the point in the trail.
+        
+        Args:
+            x: Current x coordinate.
+            y: Current y coordinate.
+        """
+        self.trail_xy[self.trail_head % TRAIL_LENGTH] = (x, y)
+        self.trail_head += 1
+        
+        point = (x, y)
+        prev = self.prev_point
+        
+        # A stationary fingertip would only redraw the same dot
+        if prev == point:
+            return
+        
+        if prev is not None:
+            cv2.line(self.canvas, prev, point, self.current_ink, self.brush_thickness)
+            self._mark_dirty(prev[0], prev[1], x, y, self.brush_thickness)
+        
+        self.prev_point = point
+    
+    def _draw_line_no_trail(self, x: int, y: int) -> None:
         """
         Draw a line from the previous position to the current position.
         
@@ -140,19 +283,18 @@ class CanvasManager:
             x: Current x coordinate.
             y: Current y coordinate.
         """
-        if self.show_trail:
-            self.trail_points.append((x, y))
+        point = (x, y)
+        prev = self.prev_point
+        
+        # A stationary fingertip would only redraw the same dot
+        if prev == point:
+            return
         
-        if self.prev_x != 0 and self.prev_y != 0:
-            cv2.line(
-                self.canvas,
-                (self.prev_x, self.prev_y),
-                (x, y),
-                self.current_color,
-                self.brush_thickness
-            )
+        if prev is not None:
+            cv2.line(self.canvas, prev, point, self.current_ink, self.brush_thickness)
+            self._mark_dirty(prev[0], prev[1], x, y, self.brush_thickness)
         
-        self.prev_x, self.prev_y = x, y
+        self.prev_point = point
     
     def erase_at(self, x: int, y: int) -> None:
         """
@@ -166,9 +308,10 @@ class CanvasManager:
             self.canvas,
             (x, y),
             self.eraser_thickness,
-            self.eraser_color,
+            BLANK_INK,
             -1
         )
+        self._mark_dirty(x, y, x, y, self.eraser_thickness, adds_ink=False)
     
     def start_shape(self, x: int, y: int) -> None:
         """
@@ -227,16 +370,18 @@ class CanvasManager:
             shape_type: Type of shape to draw.
         """
         if shape_type == 'line':
-            cv2.line(self.canvas, start, end, self.current_color, self.brush_thickness)
+            cv2.line(self.canvas, start, end, self.current_ink, self.brush_thickness)
+            self._mark_dirty(*start, *end, self.brush_thickness)
         
         elif shape_type == 'rectangle':
-            cv2.rectangle(self.canvas, start, end, self.current_color, self.brush_thickness)
+            cv2.rectangle(self.canvas, start, end, self.current_ink, self.brush_thickness)
+            self._mark_dirty(*start, *end, self.brush_thickness)
         
         elif shape_type == 'circle':
-            radius = int(math.sqrt(
-                (end[0] - start[0])**2 + (end[1] - start[1])**2
-            ))
-            cv2.circle(self.canvas, start, radius, self.current_color, self.brush_thickness)
+            radius = int(math.hypot(end[0] - start[0], end[1] - start[1]))
+            cv2.circle(self.canvas, start, radius, self.current_ink, self.brush_thickness)
+            self._mark_dirty(start[0] - radius, start[1] - radius,
+                             start[0] + radius, start[1] + radius, self.brush_thickness)
         
         elif shape_type == 'arrow':
             self._draw_arrow(start, end)
@@ -250,19 +395,29 @@ class CanvasManager:
             end: Arrow end point (with arrowhead).
         """
         # Draw main line
-        cv2.line(self.canvas, start, end, self.current_color, self.brush_thickness)
-        
-        # Calculate arrow head
-        angle = math.atan2(end[1] - start[1], end[0] - start[0])
-        
-        # Arrow head lines
-        x1 = int(end[0] - ARROW_HEAD_LENGTH * math.cos(angle - ARROW_HEAD_ANGLE))
-        y1 = int(end[1] - ARROW_HEAD_LENGTH * math.sin(angle - ARROW_HEAD_ANGLE))
-        x2 = int(end[0] - ARROW_HEAD_LENGTH * math.cos(angle + ARROW_HEAD_ANGLE))
-        y2 = int(end[1] - ARROW_HEAD_LENGTH * math.sin(angle + ARROW_HEAD_ANGLE))
-        
-        cv2.line(self.canvas, end, (x1, y1), self.current_color, self.brush_thickness)
-        cv2.line(self.canvas, end, (x2, y2), self.current_color, self.brush_thickness)
+        cv2.line(self.canvas, start, end, self.current_ink, self.brush_thickness)
+        
+        # Calculate arrow head direction (cos/sin of the shaft angle)
+        dx = end[0] - start[0]
+        dy = end[1] - start[1]
+        length = math.hypot(dx, dy)
+        if length:
+            c, s = dx / length, dy / length
+        else:
+            c, s = 1.0, 0.0
+        
+        # Arrow head lines, rotating the shaft by +/- the head angle
+        # via the angle-sum identities instead of extra trig calls
+        x1 = int(end[0] - ARROW_HEAD_LENGTH * (c * _ARROW_COS + s * _ARROW_SIN))
+        y1 = int(end[1] - ARROW_HEAD_LENGTH * (s * _ARROW_COS - c * _ARROW_SIN))
+        x2 = int(end[0] - ARROW_HEAD_LENGTH * (c * _ARROW_COS - s * _ARROW_SIN))
+        y2 = int(end[1] - ARROW_HEAD_LENGTH * (s * _ARROW_COS + c * _ARROW_SIN))
+        
+        cv2.line(self.canvas, end, (x1, y1), self.current_ink, self.brush_thickness)
+        cv2.line(self.canvas, end, (x2, y2), self.current_ink, self.brush_thickness)
+        
+        self._mark_dirty(*start, *end, self.brush_thickness)
+        self._mark_dirty(x1, y1, x2, y2, self.brush_thickness)
     
     def get_shape_preview(
         self,
@@ -310,9 +465,10 @@ class CanvasManager:
         Returns:
             True if color was changed, False if index invalid.
         """
-        if 0 <= color_index < len(self.color_names):
+        if 0 <= color_index < len(self._color_values):
             self.current_color_index = color_index
-            self.current_color = COLORS[self.color_names[color_index]]
+            self.current_color = self._color_values[color_index]
+            self.current_ink = BLANK_INK + 1 + color_index
             return True
         return False
     
@@ -349,12 +505,26 @@ class CanvasManager:
         """
         self.show_trail = not self.show_trail
         if not self.show_trail:
-            self.trail_points.clear()
+            self.trail_head = 0
+        self._bind_draw_line()
         return self.show_trail
     
+    def get_trail_points(self) -> np.ndarray:
+        """
+        Get the trail points in drawing order.
+        
+        Returns:
+            (N, 2) int32 array of (x, y) points, oldest first, valid until
+            the next call.
+        """
+        if self.trail_head < TRAIL_LENGTH:
+            return self.trail_xy[:self.trail_head]
+        return np.take(self.trail_xy, self._trail_order[self.trail_head % TRAIL_LENGTH],
+                       axis=0, out=self._trail_out)
+    
     def reset_draw_position(self) -> None:
         """Reset the previous drawing position."""
-        self.prev_x, self.prev_y = 0, 0
+        self.prev_point = None
     
     def get_history_info(self) -> Tuple[int, int]:
         """
@@ -363,8 +533,17 @@ class CanvasManager:
         Returns:
             Tuple of (current_index, total_states).
         """
-        return len(self._history), MAX_HISTORY_SIZE
+        return len(self._history) + 1, MAX_HISTORY_SIZE
     
     def get_current_color_name(self) -> str:
         """Get the name of the current color."""
         return self.color_names[self.current_color_index]
+    
+    def to_bgr(self) -> np.ndarray:
+        """
+        Get a BGR image of the canvas.
+        
+        Returns:
+            New (height, width, 3) array with blank pixels black.
+        """
+        return self.palette_lut[self.canvas]
@@ -14,6 +14,10 @@ DETECTION_CONFIDENCE: float = 0.7
 TRACKING_CONFIDENCE: float = 0.6
 MAX_NUM_HANDS: int = 1
 STATIC_IMAGE_MODE: bool = False
+HAND_SEARCH_INTERVAL: int = 3             # Frames between palm searches while no hand is tracked
+HAND_LANDMARKER_MODEL: str = "hand_landmarker.task"  # Tasks API model; legacy solution used if missing
+USE_GPU_DELEGATE: bool = True             # Tasks API only; requires Linux or macOS
+INFERENCE_SCALE: float = 0.5              # Frame scale fed to hand tracking (1.0 = full resolution)
 
 # =============================================================================
 # Gesture Detection Settings
@@ -31,6 +35,9 @@ CAMERA_WIDTH: int = 1280                   # Preferred camera width
 CAMERA_HEIGHT: int = 720                   # Preferred camera height
 CAMERA_FALLBACK_WIDTHS: List[int] = [1280, 1024, 800, 640]
 CAMERA_FALLBACK_HEIGHTS: List[int] = [720, 768, 600, 480]
+CAMERA_READ_TIMEOUT: float = 1.0           # Seconds to wait for a fresh frame
+CAMERA_CACHE_FILE: str = ".cam_cache.json" # Last working settings, kept in AUTO_SAVE_DIR
+CAMERA_FOURCC: str = "MJPG"                # Capture codec; empty string keeps driver default
 
 # =============================================================================
 # Drawing Settings
@@ -53,8 +60,10 @@ COLORS: Dict[str, Tuple[int, int, int]] = {
     'white': (255, 255, 255),
     'orange': (0, 165, 255)
 }
+# Index-ordered views of COLORS, so hot paths index by int instead of name
+COLOR_NAMES: Tuple[str, ...] = tuple(COLORS.keys())
+COLOR_LIST: Tuple[Tuple[int, int, int], ...] = tuple(COLORS.values())
 DEFAULT_COLOR_INDEX: int = 1  # Default to 'green'
-ERASER_COLOR: Tuple[int, int, int] = (0, 0, 0)
 
 # =============================================================================
 # Shape Drawing Settings
@@ -68,8 +77,12 @@ ARROW_HEAD_ANGLE: float = 0.5236  # pi/6 radians (30 degrees)
 # Canvas & Display Settings
 # =============================================================================
 CANVAS_BLEND_ALPHA: float = 0.7           # Frame-canvas blend ratio
+USE_OPENCL: bool = False                   # Blend on the GPU via OpenCV's T-API when available
 TRAIL_LENGTH: int = 8                      # Finger trail visualization length
 SHOW_TRAIL_DEFAULT: bool = True
+DRAW_LANDMARKS: bool = False               # Overlay the tracked hand skeleton (debugging aid)
+LANDMARK_COLOR: Tuple[int, int, int] = (0, 0, 255)      # Hand skeleton joints
+CONNECTION_COLOR: Tuple[int, int, int] = (255, 255, 255)  # Hand skeleton bones
 
 # =============================================================================
 # History (Undo/Redo) Settings
@@ -83,6 +96,10 @@ AUTO_SAVE_INTERVAL: int = 30              # Seconds between auto-saves
 AUTO_SAVE_DIR: str = "auto_saves"
 AUTO_SAVE_MAX_FILES: int = 10             # Maximum auto-save files to keep
 AUTO_SAVE_FORMAT: str = "jpg"
+AUTO_SAVE_JPEG_QUALITY: int = 80          # JPEG quality for auto-saves
+SAVE_JPEG_QUALITY: int = 95               # JPEG quality for explicit saves
+SAVE_QUEUE_SIZE: int = 4                  # Pending saves before auto-saves are dropped
+SAVE_BUFFER_COUNT: int = 2                # Reusable canvas snapshots for the save worker
 
 # =============================================================================
 # UI Settings
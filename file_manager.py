@@ -7,17 +7,29 @@ Includes proper error handling and path validation.
 
 import os
 import time
+import queue
 import logging
+import threading
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import cv2
 import numpy as np
 
+# Optional: libjpeg-turbo encoder, falls back to cv2.imwrite when missing
+try:
+    from turbojpeg import TurboJPEG
+except ImportError:
+    TurboJPEG = None
+
 from config import (
     AUTO_SAVE_DIR,
     AUTO_SAVE_INTERVAL,
     AUTO_SAVE_MAX_FILES,
-    AUTO_SAVE_FORMAT
+    AUTO_SAVE_FORMAT,
+    AUTO_SAVE_JPEG_QUALITY,
+    SAVE_JPEG_QUALITY,
+    SAVE_QUEUE_SIZE,
+    SAVE_BUFFER_COUNT
 )
 
 logger = logging.getLogger(__name__)
@@ -35,11 +47,124 @@ class FileManager:
         """
         self.base_dir = Path(base_dir) if base_dir else Path(__file__).parent.absolute()
         self.auto_save_dir = self.base_dir / AUTO_SAVE_DIR
-        self.last_save_time = time.time()
+        self.last_save_time = time.monotonic()  # Elapsed-time clock for the interval check
         self.auto_save_interval = AUTO_SAVE_INTERVAL
         self.max_auto_saves = AUTO_SAVE_MAX_FILES
         
         self._ensure_auto_save_directory()
+        
+        self._turbo_jpeg = None
+        if TurboJPEG is not None:
+            try:
+                self._turbo_jpeg = TurboJPEG()
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"TurboJPEG unavailable, using OpenCV encoder: {e}")
+        
+        # Reusable snapshot buffers handed to the save worker and returned
+        # once written. None marks a slot that has not been allocated yet.
+        self._free_buffers: queue.Queue = queue.Queue()
+        for _ in range(SAVE_BUFFER_COUNT):
+            self._free_buffers.put(None)
+        
+        # Background worker so image encoding and disk writes never
+        # stall the main loop. Items are
+        # (path, image, palette, is_auto_save, pooled).
+        self._save_queue: queue.Queue = queue.Queue(maxsize=SAVE_QUEUE_SIZE)
+        self._save_worker = threading.Thread(
+            target=self._save_loop,
+            name="FileSaveWorker",
+            daemon=True
+        )
+        self._save_worker.start()
+    
+    def _save_loop(self) -> None:
+        """Write queued images to disk until a None sentinel is received."""
+        while True:
+            item = self._save_queue.get()
+            try:
+                if item is None:
+                    return
+                
+                filepath, image, palette, is_auto_save, pooled = item
+                self._write_image(filepath, image, is_auto_save, palette)
+                if pooled:
+                    self._free_buffers.put(image)
+            finally:
+                self._save_queue.task_done()
+    
+    def _snapshot(self, canvas: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Copy the canvas into a free snapshot buffer.
+        
+        Args:
+            canvas: The canvas to copy.
+            
+        Returns:
+            The filled buffer, or None if all buffers are still being written.
+        """
+        try:
+            buffer = self._free_buffers.get_nowait()
+        except queue.Empty:
+            return None
+        
+        if buffer is None or buffer.shape != canvas.shape or buffer.dtype != canvas.dtype:
+            buffer = np.empty_like(canvas)
+        
+        np.copyto(buffer, canvas)
+        return buffer
+    
+    def _write_image(
+        self,
+        filepath: Path,
+        image: np.ndarray,
+        is_auto_save: bool,
+        palette: Optional[np.ndarray] = None
+    ) -> bool:
+        """
+        Encode and write an image, running auto-save cleanup afterwards.
+        
+        Args:
+            filepath: Destination path.
+            image: Image to write.
+            is_auto_save: Whether this is an auto-save.
+            palette: (256, 3) BGR lookup table if image holds palette indices.
+            
+        Returns:
+            True if the file was written.
+        """
+        # Recreate the auto-save directory here, off the main loop, in case
+        # it was removed while running
+        if is_auto_save and not self._ensure_auto_save_directory():
+            return False
+        
+        if palette is not None:
+            image = palette[image]
+        
+        quality = AUTO_SAVE_JPEG_QUALITY if is_auto_save else SAVE_JPEG_QUALITY
+        is_jpeg = filepath.suffix.lower() in ('.jpg', '.jpeg')
+        
+        try:
+            if is_jpeg and self._turbo_jpeg is not None:
+                filepath.write_bytes(self._turbo_jpeg.encode(image, quality=quality))
+                success = True
+            elif is_jpeg:
+                success = cv2.imwrite(str(filepath), image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            else:
+                success = cv2.imwrite(str(filepath), image)
+        except Exception as e:
+            logger.error(f"Error writing {filepath}: {e}")
+            return False
+        
+        if not success:
+            logger.error(f"Failed to write canvas file: {filepath}")
+            return False
+        
+        if is_auto_save:
+            self._cleanup_old_auto_saves()
+            logger.info(f"Auto-saved: {filepath.name}")
+        else:
+            logger.info(f"Canvas saved: {filepath}")
+        return True
     
     def _ensure_auto_save_directory(self) -> bool:
         """
@@ -55,6 +180,28 @@ class FileManager:
             logger.error(f"Failed to create auto-save directory: {e}")
             return False
     
+    def _scan_auto_saves(self) -> List[Tuple[float, str]]:
+        """
+        Scan the auto-save directory with a single stat per entry.
+        
+        Returns:
+            List of (mtime, path) tuples sorted newest first.
+        """
+        prefix = "auto_save_"
+        suffix = f".{AUTO_SAVE_FORMAT}"
+        
+        with os.scandir(self.auto_save_dir) as it:
+            entries = [
+                (entry.stat().st_mtime, entry.path)
+                for entry in it
+                if entry.name.startswith(prefix)
+                and entry.name.endswith(suffix)
+                and entry.is_file()
+            ]
+        
+        entries.sort(reverse=True)
+        return entries
+    
     def _cleanup_old_auto_saves(self) -> int:
         """
         Remove old auto-save files, keeping only the most recent ones.
@@ -63,20 +210,16 @@ class FileManager:
             Number of files deleted.
         """
         try:
-            auto_saves = sorted(
-                self.auto_save_dir.glob(f"auto_save_*.{AUTO_SAVE_FORMAT}"),
-                key=lambda p: p.stat().st_mtime,
-                reverse=True
-            )
+            auto_saves = self._scan_auto_saves()
             
             files_to_delete = auto_saves[self.max_auto_saves:]
             deleted_count = 0
             
-            for old_file in files_to_delete:
+            for _, old_file in files_to_delete:
                 try:
-                    old_file.unlink()
+                    os.unlink(old_file)
                     deleted_count += 1
-                    logger.debug(f"Deleted old auto-save: {old_file.name}")
+                    logger.debug(f"Deleted old auto-save: {os.path.basename(old_file)}")
                 except OSError as e:
                     logger.warning(f"Failed to delete {old_file}: {e}")
             
@@ -85,55 +228,72 @@ class FileManager:
             logger.error(f"Error during auto-save cleanup: {e}")
             return 0
     
-    def auto_save_canvas(self, canvas: np.ndarray) -> Optional[str]:
+    def auto_save_canvas(
+        self,
+        canvas: np.ndarray,
+        palette: Optional[np.ndarray] = None
+    ) -> Optional[str]:
         """
         Auto-save the canvas if the interval has passed.
         
+        The image is written by the background save worker.
+        
         Args:
             canvas: The canvas numpy array to save.
+            palette: (256, 3) BGR lookup table if canvas holds palette
+                indices; it is applied on the save worker.
             
         Returns:
-            Filename if saved, None otherwise.
+            Filename if queued for saving, None otherwise. The file is
+            logged once it has actually been written.
         """
         if canvas is None:
             return None
         
-        current_time = time.time()
+        # Only a clock read on the frames that do not save; everything
+        # touching the disk happens on the save worker
+        current_time = time.monotonic()
         if current_time - self.last_save_time < self.auto_save_interval:
             return None
         
-        if not self._ensure_auto_save_directory():
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        filename = self.auto_save_dir / f"auto_save_{timestamp}.{AUTO_SAVE_FORMAT}"
+        
+        # Drop this auto-save rather than block the main loop
+        snapshot = self._snapshot(canvas)
+        if snapshot is None:
+            logger.warning(f"Previous saves still pending, skipping auto-save: {filename.name}")
             return None
         
         try:
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            filename = self.auto_save_dir / f"auto_save_{timestamp}.{AUTO_SAVE_FORMAT}"
-            
-            success = cv2.imwrite(str(filename), canvas)
-            
-            if success:
-                self.last_save_time = current_time
-                self._cleanup_old_auto_saves()
-                logger.info(f"Auto-saved: {filename.name}")
-                return str(filename)
-            else:
-                logger.error(f"Failed to write auto-save file: {filename}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Error during auto-save: {e}")
+            self._save_queue.put_nowait((filename, snapshot, palette, True, True))
+        except queue.Full:
+            self._free_buffers.put(snapshot)
+            logger.warning(f"Save queue full, skipping auto-save: {filename.name}")
             return None
+        
+        self.last_save_time = current_time
+        return str(filename)
     
-    def save_canvas(self, canvas: np.ndarray, filename: Optional[str] = None) -> Optional[str]:
+    def save_canvas(
+        self,
+        canvas: np.ndarray,
+        filename: Optional[str] = None,
+        palette: Optional[np.ndarray] = None
+    ) -> Optional[str]:
         """
         Save the canvas to a file.
         
+        The image is written by the background save worker.
+        
         Args:
             canvas: The canvas numpy array to save.
             filename: Optional custom filename. Auto-generates if not provided.
+            palette: (256, 3) BGR lookup table if canvas holds palette
+                indices; it is applied on the save worker.
             
         Returns:
-            Full path of saved file, or None on error.
+            Full path of the file queued for saving, or None on error.
         """
         if canvas is None:
             logger.warning("Cannot save: canvas is None")
@@ -146,14 +306,14 @@ class FileManager:
             
             filepath = self.base_dir / filename
             
-            success = cv2.imwrite(str(filepath), canvas)
-            
-            if success:
-                logger.info(f"Canvas saved: {filepath}")
-                return str(filepath)
+            # Explicit saves are never dropped: fall back to a fresh copy
+            # when no snapshot buffer is free, and wait for queue space
+            snapshot = self._snapshot(canvas)
+            if snapshot is None:
+                self._save_queue.put((filepath, canvas.copy(), palette, False, False))
             else:
-                logger.error(f"Failed to write canvas file: {filepath}")
-                return None
+                self._save_queue.put((filepath, snapshot, palette, False, True))
+            return str(filepath)
                 
         except Exception as e:
             logger.error(f"Error saving canvas: {e}")
@@ -167,11 +327,7 @@ class FileManager:
             List of Path objects for auto-save files.
         """
         try:
-            return sorted(
-                self.auto_save_dir.glob(f"auto_save_*.{AUTO_SAVE_FORMAT}"),
-                key=lambda p: p.stat().st_mtime,
-                reverse=True
-            )
+            return [Path(path) for _, path in self._scan_auto_saves()]
         except Exception as e:
             logger.error(f"Error listing auto-saves: {e}")
             return []
@@ -203,3 +359,9 @@ class FileManager:
         except Exception as e:
             logger.error(f"Error loading canvas: {e}")
             return None
+    
+    def close(self) -> None:
+        """Finish any pending saves and stop the save worker."""
+        if self._save_worker.is_alive():
+            self._save_queue.put(None)
+            self._save_worker.join()
@@ -5,10 +5,17 @@ Handles hand detection and gesture recognition using MediaPipe.
 Includes gesture buffering for smooth recognition.
 """
 
+import time
 import logging
-from collections import deque
-from typing import Dict, Tuple, Optional, List
+from collections import Counter, deque
+from pathlib import Path
+from typing import Dict, Tuple, Optional, List, NamedTuple
+import cv2
+import numpy as np
 import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
+from mediapipe.tasks.python import vision
+from mediapipe.tasks.python.core.base_options import BaseOptions
 
 from config import (
     DETECTION_CONFIDENCE,
@@ -19,12 +26,56 @@ from config import (
     GESTURE_BUFFER_SIZE,
     GESTURE_CONFIRMATION_FRAMES,
     GESTURE_CONFIRMATION_COUNT,
-    SMOOTHING_BUFFER_SIZE
+    SMOOTHING_BUFFER_SIZE,
+    HAND_SEARCH_INTERVAL,
+    HAND_LANDMARKER_MODEL,
+    USE_GPU_DELEGATE,
+    LANDMARK_COLOR,
+    CONNECTION_COLOR
 )
 
+# Optional: Numba-compiled per-hand helpers, NumPy is used when missing
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 logger = logging.getLogger(__name__)
 
 
+if njit is not None:
+    # At 21 landmarks NumPy's per-call overhead dominates, so these
+    # scalar loops compile to much less work. cache=True keeps the
+    # compiled code in __pycache__ so only the first launch pays for it.
+    
+    @njit(cache=True)
+    def _finger_mask_jit(pts, tips, mcps, threshold):
+        """Bitmask of fingers whose tip is above their MCP joint by threshold."""
+        mask = 0
+        for i in range(tips.shape[0]):
+            if pts[mcps[i], 1] - pts[tips[i], 1] > threshold:
+                mask |= 1 << i
+        return mask
+    
+    @njit(cache=True)
+    def _finger_positions_jit(pts, width, height):
+        """Pixel (index_x, index_y, palm_x, palm_y) from normalized landmarks."""
+        return (
+            int(pts[8, 0] * width),
+            int(pts[8, 1] * height),
+            int((pts[0, 0] + pts[9, 0]) * width / 2),
+            int((pts[0, 1] + pts[9, 1]) * height / 2)
+        )
+else:
+    _finger_mask_jit = None
+    _finger_positions_jit = None
+
+
+class _TaskResults(NamedTuple):
+    """Tasks API output exposed under the legacy solution's field name."""
+    multi_hand_landmarks: Optional[List[landmark_pb2.NormalizedLandmarkList]]
+
+
 class GestureRecognizer:
     """Handles hand gesture detection and recognition."""
     
@@ -38,35 +89,178 @@ class GestureRecognizer:
     def __init__(self):
         """Initialize the gesture recognizer with MediaPipe."""
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=STATIC_IMAGE_MODE,
-            max_num_hands=MAX_NUM_HANDS,
-            min_detection_confidence=DETECTION_CONFIDENCE,
-            min_tracking_confidence=TRACKING_CONFIDENCE
-        )
-        self.mp_drawing = mp.solutions.drawing_utils
+        
+        # Prefer the Tasks API HandLandmarker (GPU capable) when its model
+        # file is available, otherwise use the legacy CPU-only solution
+        self._landmarker: Optional[vision.HandLandmarker] = None
+        self._last_timestamp_ms: int = 0
+        self.hands = None
+        
+        model_path = Path(__file__).parent.absolute() / HAND_LANDMARKER_MODEL
+        if HAND_LANDMARKER_MODEL and model_path.is_file():
+            self._landmarker = self._create_landmarker(model_path)
+        
+        if self._landmarker is None:
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=STATIC_IMAGE_MODE,
+                max_num_hands=MAX_NUM_HANDS,
+                min_detection_confidence=DETECTION_CONFIDENCE,
+                min_tracking_confidence=TRACKING_CONFIDENCE
+            )
+        
+        # (connections, 2) landmark index pairs of the hand skeleton
+        self._hand_connections = np.array(sorted(self.mp_hands.HAND_CONNECTIONS), dtype=np.intp)
         
         # Gesture smoothing buffer using deque for O(1) operations
         self.gesture_buffer: deque = deque(maxlen=GESTURE_BUFFER_SIZE)
         
-        # Coordinate smoothing buffer
-        self.smoothing_buffer: deque = deque(maxlen=SMOOTHING_BUFFER_SIZE)
+        # Gesture counts over the last GESTURE_CONFIRMATION_FRAMES entries,
+        # updated incrementally as the buffer slides
+        self._gesture_counts: Counter = Counter()
+        
+        # Coordinate smoothing: exponential moving average with the same
+        # effective window as a SMOOTHING_BUFFER_SIZE-point average
+        self._ema_alpha: float = 2 / (SMOOTHING_BUFFER_SIZE + 1)
+        self._ema_x: float = 0.0
+        self._ema_y: float = 0.0
+        self._ema_init: bool = False
+        
+        # Detection cadence: while no hand is tracked, only every
+        # HAND_SEARCH_INTERVAL-th frame is sent through the palm detector
+        self._frame_idx: int = 0
+        self._last_results: Optional[object] = None
         
         # Landmark indices for finger detection
-        self._finger_tips = (8, 12, 16, 20)  # Index, Middle, Ring, Pinky tips
-        self._finger_mcps = (5, 9, 13, 17)   # Corresponding MCP joints
+        self._finger_tips = np.array((8, 12, 16, 20))  # Index, Middle, Ring, Pinky tips
+        self._finger_mcps = np.array((5, 9, 13, 17))   # Corresponding MCP joints
+        self._finger_bits = np.array((1, 2, 4, 8))     # Bit of each finger in the mask
+        
+        # Gesture for each mask of extended fingers; the thumb does not
+        # take part in classification
+        self._gesture_table: Tuple[str, ...] = self._build_gesture_table()
+        
+        # (21, 2) array of normalized landmark (x, y) for the hand last
+        # seen, so every per-hand helper shares one unpacking pass
+        self._pts_source: Optional[object] = None
+        self._pts: Optional[np.ndarray] = None
+    
+    def _create_landmarker(self, model_path: Path) -> Optional[vision.HandLandmarker]:
+        """
+        Create a Tasks API hand landmarker, trying the GPU delegate first.
+        
+        The GPU delegate is only available on Linux and macOS; elsewhere
+        creation fails and the CPU delegate is used instead.
+        
+        Args:
+            model_path: Path to the hand_landmarker.task model.
+            
+        Returns:
+            The landmarker, or None if it could not be created.
+        """
+        delegates = [BaseOptions.Delegate.CPU]
+        if USE_GPU_DELEGATE:
+            delegates.insert(0, BaseOptions.Delegate.GPU)
+        
+        for delegate in delegates:
+            try:
+                options = vision.HandLandmarkerOptions(
+                    base_options=BaseOptions(
+                        model_asset_path=str(model_path),
+                        delegate=delegate
+                    ),
+                    running_mode=vision.RunningMode.VIDEO,
+                    num_hands=MAX_NUM_HANDS,
+                    min_hand_detection_confidence=DETECTION_CONFIDENCE,
+                    min_hand_presence_confidence=TRACKING_CONFIDENCE,
+                    min_tracking_confidence=TRACKING_CONFIDENCE
+                )
+                landmarker = vision.HandLandmarker.create_from_options(options)
+                logger.info(f"Using MediaPipe HandLandmarker ({delegate.name} delegate)")
+                return landmarker
+            except Exception as e:
+                logger.warning(f"HandLandmarker with {delegate.name} delegate unavailable: {e}")
+        
+        return None
+    
+    def _detect(self, rgb_frame) -> object:
+        """
+        Run hand detection with whichever MediaPipe backend is active.
+        
+        Args:
+            rgb_frame: RGB image frame from camera.
+            
+        Returns:
+            Results with a multi_hand_landmarks attribute.
+        """
+        if self._landmarker is None:
+            return self.hands.process(rgb_frame)
+        
+        # VIDEO mode requires strictly increasing timestamps
+        timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        result = self._landmarker.detect_for_video(image, timestamp_ms)
+        
+        if not result.hand_landmarks:
+            return _TaskResults(None)
+        
+        # Convert to the protobuf lists the rest of the pipeline expects
+        hands = []
+        for hand in result.hand_landmarks:
+            landmark_list = landmark_pb2.NormalizedLandmarkList()
+            landmark_list.landmark.extend(
+                landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z) for lm in hand
+            )
+            hands.append(landmark_list)
+        return _TaskResults(hands)
     
     def process_frame(self, rgb_frame) -> Optional[object]:
         """
         Process a frame and return hand detection results.
         
+        While a hand is being tracked every frame is processed; MediaPipe
+        then derives the hand region from the previous landmarks and skips
+        the palm detector. With no hand in view, the detector would run on
+        every frame, so only every HAND_SEARCH_INTERVAL-th frame is searched
+        and the previous (empty) result is returned otherwise.
+        
         Args:
             rgb_frame: RGB image frame from camera.
             
         Returns:
             MediaPipe hand detection results, or None if no hands detected.
         """
-        return self.hands.process(rgb_frame)
+        self._frame_idx += 1
+        
+        last = self._last_results
+        if (last is not None and not last.multi_hand_landmarks
+                and self._frame_idx % HAND_SEARCH_INTERVAL):
+            return last
+        
+        self._last_results = self._detect(rgb_frame)
+        return self._last_results
+    
+    def _landmark_array(self, hand_landmarks) -> np.ndarray:
+        """
+        Get the hand's landmarks as a (21, 2) float32 array of (x, y).
+        
+        The array is built once per hand per frame and reused by every
+        helper called with the same landmarks object.
+        
+        Args:
+            hand_landmarks: MediaPipe hand landmarks.
+            
+        Returns:
+            Normalized landmark coordinates.
+        """
+        if hand_landmarks is not self._pts_source:
+            self._pts = np.array(
+                [(p.x, p.y) for p in hand_landmarks.landmark],
+                dtype=np.float32
+            )
+            self._pts_source = hand_landmarks
+        return self._pts
     
     def get_finger_positions(
         self, 
@@ -84,20 +278,23 @@ class GestureRecognizer:
             Dictionary with 'index' and 'palm' positions as (x, y) tuples.
         """
         height, width = frame_shape
-        landmarks = hand_landmarks.landmark
+        pts = self._landmark_array(hand_landmarks)
+        
+        if _finger_positions_jit is not None:
+            index_x, index_y, palm_x, palm_y = _finger_positions_jit(pts, width, height)
+            return {
+                'index': (index_x, index_y),
+                'palm': (palm_x, palm_y)
+            }
         
         # Index finger tip position
-        index_tip = landmarks[8]
-        index_pos = (int(index_tip.x * width), int(index_tip.y * height))
+        index_x, index_y = (pts[8] * (width, height)).astype(np.int32).tolist()
         
         # Palm center (average of wrist and middle MCP)
-        wrist = landmarks[0]
-        middle_mcp = landmarks[9]
-        palm_x = int((wrist.x + middle_mcp.x) * width / 2)
-        palm_y = int((wrist.y + middle_mcp.y) * height / 2)
+        palm_x, palm_y = ((pts[0] + pts[9]) * (width / 2, height / 2)).astype(np.int32).tolist()
         
         return {
-            'index': index_pos,
+            'index': (index_x, index_y),
             'palm': (palm_x, palm_y)
         }
     
@@ -111,19 +308,15 @@ class GestureRecognizer:
         Returns:
             List of 5 booleans [thumb, index, middle, ring, pinky].
         """
-        lm = landmarks.landmark
-        fingers = []
+        pts = self._landmark_array(landmarks)
         
         # Thumb detection (horizontal movement)
-        thumb_extended = abs(lm[4].x - lm[2].x) > FINGER_EXTENSION_THRESHOLD
-        fingers.append(thumb_extended)
+        thumb_extended = bool(abs(pts[4, 0] - pts[2, 0]) > FINGER_EXTENSION_THRESHOLD)
         
-        # Other fingers (vertical movement)
-        for tip_id, mcp_id in zip(self._finger_tips, self._finger_mcps):
-            finger_extended = (lm[mcp_id].y - lm[tip_id].y) > FINGER_EXTENSION_THRESHOLD
-            fingers.append(finger_extended)
+        # Other fingers (vertical movement), compared in one vector op
+        others = (pts[self._finger_mcps, 1] - pts[self._finger_tips, 1]) > FINGER_EXTENSION_THRESHOLD
         
-        return fingers
+        return [thumb_extended, *others.tolist()]
     
     def detect_gesture(self, hand_landmarks) -> str:
         """
@@ -135,25 +328,50 @@ class GestureRecognizer:
         Returns:
             Gesture string constant.
         """
-        fingers = self._detect_extended_fingers(hand_landmarks)
+        return self._gesture_table[self._extended_finger_mask(hand_landmarks)]
+    
+    def _extended_finger_mask(self, landmarks) -> int:
+        """
+        Detect which non-thumb fingers are extended, as a bitmask.
         
-        # Count extended fingers (excluding thumb)
-        extended_count = sum(fingers[1:])
+        Args:
+            landmarks: MediaPipe hand landmarks.
+            
+        Returns:
+            Bit 0 = index, 1 = middle, 2 = ring, 3 = pinky.
+        """
+        pts = self._landmark_array(landmarks)
+        if _finger_mask_jit is not None:
+            return _finger_mask_jit(pts, self._finger_tips, self._finger_mcps,
+                                    FINGER_EXTENSION_THRESHOLD)
         
-        index_up = fingers[1]
-        middle_up = fingers[2]
+        others = (pts[self._finger_mcps, 1] - pts[self._finger_tips, 1]) > FINGER_EXTENSION_THRESHOLD
+        return int(others @ self._finger_bits)
+    
+    @classmethod
+    def _build_gesture_table(cls) -> Tuple[str, ...]:
+        """
+        Classify every combination of extended non-thumb fingers.
+        
+        Returns:
+            Gesture for each bitmask from _extended_finger_mask().
+        """
+        index_up, middle_up = 0b0001, 0b0010
         
-        # Gesture classification
-        if extended_count >= 4:  # Open palm
-            return self.GESTURE_PALM_ERASE
-        elif extended_count == 1 and index_up:  # Only index finger
-            return self.GESTURE_DRAWING
-        elif extended_count == 2 and index_up and middle_up:  # Peace sign
-            return self.GESTURE_SHAPE_MODE
-        elif extended_count == 0:  # Fist
-            return self.GESTURE_PAUSE
-        else:
-            return self.GESTURE_NONE
+        table = []
+        for mask in range(16):
+            extended_count = bin(mask).count("1")
+            if extended_count >= 4:  # Open palm
+                table.append(cls.GESTURE_PALM_ERASE)
+            elif mask == index_up:  # Only index finger
+                table.append(cls.GESTURE_DRAWING)
+            elif mask == index_up | middle_up:  # Peace sign
+                table.append(cls.GESTURE_SHAPE_MODE)
+            elif extended_count == 0:  # Fist
+                table.append(cls.GESTURE_PAUSE)
+            else:
+                table.append(cls.GESTURE_NONE)
+        return tuple(table)
     
     def get_stable_gesture(self, current_gesture: str) -> str:
         """
@@ -166,22 +384,26 @@ class GestureRecognizer:
         Returns:
             Stabilized gesture string.
         """
+        counts = self._gesture_counts
+        
+        # Slide the confirmation window: the entry that falls out of the
+        # last GESTURE_CONFIRMATION_FRAMES after this append stops counting
+        if len(self.gesture_buffer) >= GESTURE_CONFIRMATION_FRAMES:
+            leaving = self.gesture_buffer[-GESTURE_CONFIRMATION_FRAMES]
+            counts[leaving] -= 1
+            if not counts[leaving]:
+                del counts[leaving]
+        
         self.gesture_buffer.append(current_gesture)
+        counts[current_gesture] += 1
         
         if len(self.gesture_buffer) < GESTURE_CONFIRMATION_FRAMES:
             return current_gesture
         
-        # Count gestures in recent frames using Counter-like logic
-        # Iterate directly over deque slice (more efficient than list conversion)
-        gesture_counts: Dict[str, int] = {}
-        for i, g in enumerate(self.gesture_buffer):
-            if i >= len(self.gesture_buffer) - GESTURE_CONFIRMATION_FRAMES:
-                gesture_counts[g] = gesture_counts.get(g, 0) + 1
+        # Find most common gesture in recent frames
+        most_common, most_common_count = counts.most_common(1)[0]
         
-        # Find most common gesture
-        most_common = max(gesture_counts, key=gesture_counts.get)
-        
-        if gesture_counts[most_common] >= GESTURE_CONFIRMATION_COUNT:
+        if most_common_count >= GESTURE_CONFIRMATION_COUNT:
             return most_common
         
         # Fall back to previous gesture if no clear majority
@@ -202,26 +424,16 @@ class GestureRecognizer:
         Returns:
             Smoothed (x, y) tuple.
         """
-        self.smoothing_buffer.append((x, y))
-        
-        if len(self.smoothing_buffer) < 2:
+        if not self._ema_init:
+            self._ema_x, self._ema_y = float(x), float(y)
+            self._ema_init = True
             return x, y
         
-        # Use last 3 points for smoothing (or fewer if not available)
-        points_to_use = min(3, len(self.smoothing_buffer))
+        alpha = self._ema_alpha
+        self._ema_x += alpha * (x - self._ema_x)
+        self._ema_y += alpha * (y - self._ema_y)
         
-        # Calculate average directly from deque tail
-        total_x = 0
-        total_y = 0
-        for i in range(1, points_to_use + 1):
-            idx = -i
-            total_x += self.smoothing_buffer[idx][0]
-            total_y += self.smoothing_buffer[idx][1]
-        
-        avg_x = total_x // points_to_use
-        avg_y = total_y // points_to_use
-        
-        return avg_x, avg_y
+        return int(self._ema_x), int(self._ema_y)
     
     def draw_hand_landmarks(self, frame, hand_landmarks) -> None:
         """
@@ -231,17 +443,24 @@ class GestureRecognizer:
             frame: BGR frame to draw on.
             hand_landmarks: MediaPipe hand landmarks.
         """
-        self.mp_drawing.draw_landmarks(
-            frame, 
-            hand_landmarks, 
-            self.mp_hands.HAND_CONNECTIONS
-        )
+        height, width = frame.shape[:2]
+        pts = (self._landmark_array(hand_landmarks) * (width, height)).astype(np.int32)
+        
+        # One polylines call per layer: every bone is a two-point polyline,
+        # and every joint a one-point polyline, which a thick line draws
+        # as a dot
+        cv2.polylines(frame, pts[self._hand_connections], False, CONNECTION_COLOR, 2)
+        cv2.polylines(frame, pts.reshape(-1, 1, 2), False, LANDMARK_COLOR, 5)
     
     def reset_buffers(self) -> None:
         """Clear gesture and smoothing buffers."""
         self.gesture_buffer.clear()
-        self.smoothing_buffer.clear()
+        self._gesture_counts.clear()
+        self._ema_init = False
     
     def close(self) -> None:
         """Release MediaPipe resources."""
-        self.hands.close()
+        if self._landmarker is not None:
+            self._landmarker.close()
+        if self.hands is not None:
+            self.hands.close()
@@ -26,17 +26,20 @@ Keyboard Shortcuts:
 import logging
 import time
 import sys
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Optional, Tuple
 
 import cv2
 import numpy as np
 
 # Local modules
-from config import CANVAS_BLEND_ALPHA
+from config import CANVAS_BLEND_ALPHA, INFERENCE_SCALE, DRAW_LANDMARKS
 from camera_manager import CameraManager
 from gesture_recognizer import GestureRecognizer
 from canvas_manager import CanvasManager
-from ui_renderer import UIRenderer
+from ui_renderer import UIOverlay, UIRenderer
 from file_manager import FileManager
 
 # Configure logging
@@ -46,6 +49,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of status panel overlays kept for recently shown UI states
+_HUD_CACHE_SIZE = 16
+
 
 class SmartBoard:
     """Main application class coordinating all components."""
@@ -60,9 +66,34 @@ class SmartBoard:
         
         # FPS tracking
         self._fps_counter: int = 0
-        self._fps_start_time: float = time.time()
+        self._fps_start_ns: int = time.perf_counter_ns()
         self._current_fps: int = 0
         
+        # Reusable buffers for the downscaled frame and its RGB version fed
+        # to MediaPipe. They are only rewritten while no inference job is
+        # reading them.
+        self._small_buf: Optional[np.ndarray] = None
+        self._rgb_buf: Optional[np.ndarray] = None
+        
+        # Hand tracking runs on its own thread so capture and rendering
+        # are not held up by inference
+        self._inference_pool: Optional[ThreadPoolExecutor] = None
+        self._inference_job: Optional[Future] = None
+        self._last_landmarks: list = []
+        self._last_gesture: str = GestureRecognizer.GESTURE_NONE
+        self._last_positions: dict = {'index': (0, 0), 'palm': (0, 0)}
+        
+        # Pre-rendered UI: the palette boxes and instructions never change;
+        # the status panel and palette selection are rendered once per
+        # state they show. Recent states are kept (least recently used
+        # evicted first) so flickering between gestures hits the cache.
+        self._static_overlay: Optional[UIOverlay] = None
+        self._static_shape: Optional[tuple] = None
+        self._hud_cache: OrderedDict = OrderedDict()
+        
+        # Keyboard shortcuts
+        self._key_table: Dict[int, Callable[[], bool]] = self._build_key_table()
+        
         # State tracking
         self._is_running: bool = False
     
@@ -90,75 +121,147 @@ class SmartBoard:
         self.ui_renderer = UIRenderer()
         self.file_manager = FileManager()
         
+        self._small_buf = np.empty(self._inference_shape(height, width), dtype=np.uint8)
+        self._rgb_buf = np.empty_like(self._small_buf)
+        self._inference_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="HandTracking")
+        
         logger.info("All components initialized successfully")
         return True
     
+    @staticmethod
+    def _inference_shape(height: int, width: int) -> Tuple[int, int, int]:
+        """
+        Get the shape of the frame fed to hand tracking.
+        
+        Args:
+            height: Camera frame height.
+            width: Camera frame width.
+            
+        Returns:
+            (height, width, channels) scaled by INFERENCE_SCALE.
+        """
+        return (max(1, round(height * INFERENCE_SCALE)),
+                max(1, round(width * INFERENCE_SCALE)), 3)
+    
     def _update_fps(self) -> None:
         """Update FPS counter."""
         self._fps_counter += 1
-        current_time = time.time()
+        current_ns = time.perf_counter_ns()
         
-        if current_time - self._fps_start_time >= 1.0:
+        # Integer nanoseconds from a monotonic clock, unaffected by
+        # wall-clock adjustments
+        if current_ns - self._fps_start_ns >= 1_000_000_000:
             self._current_fps = self._fps_counter
             self._fps_counter = 0
-            self._fps_start_time = current_time
+            self._fps_start_ns = current_ns
+    
+    def _build_key_table(self) -> Dict[int, Callable[[], bool]]:
+        """
+        Build the key code -> handler dispatch table.
+        
+        Every handler returns True if the application should quit.
+        
+        Returns:
+            Mapping of 8-bit key codes to handlers.
+        """
+        table: Dict[int, Callable[[], bool]] = {
+            ord('q'): self._on_quit,
+            ord('c'): self._on_clear,
+            ord('s'): self._on_save,
+            ord('z'): self._on_undo,
+            ord('x'): self._on_redo,
+            ord('t'): self._on_toggle_trail,
+            ord(' '): self._on_cycle_shape,
+            ord('-'): self._on_decrease_brush,
+            ord('='): self._on_increase_brush,
+            ord('+'): self._on_increase_brush,
+            13: self._on_complete_shape,  # Enter key
+        }
+        for color_index in range(8):
+            table[ord('1') + color_index] = partial(self._on_set_color, color_index)
+        return table
     
     def _handle_keyboard_input(self, key: int) -> bool:
         """
         Handle keyboard input.
         
         Args:
-            key: Key code from cv2.waitKey().
+            key: Key code from cv2.pollKey(), masked to 8 bits.
             
         Returns:
             True if should quit, False otherwise.
         """
-        if key == ord('q'):
-            return True
-        
-        elif key == ord('c'):
-            self.canvas_manager.clear_canvas()
-            logger.info("🗑️ Canvas cleared!")
-        
-        elif key == ord('s'):
-            saved_path = self.file_manager.save_canvas(self.canvas_manager.canvas)
-            if saved_path:
-                logger.info(f"💾 Drawing saved as {saved_path}")
-        
-        elif key == ord('z'):
-            if self.canvas_manager.undo():
-                logger.info("↶ Undo")
-        
-        elif key == ord('x'):
-            if self.canvas_manager.redo():
-                logger.info("↷ Redo")
-        
-        elif key == ord('t'):
-            new_state = self.canvas_manager.toggle_trail()
-            logger.info(f"✨ Trail: {'ON' if new_state else 'OFF'}")
-        
-        elif key == ord(' '):
-            new_shape = self.canvas_manager.cycle_shape()
-            logger.info(f"🔷 Shape: {new_shape}")
-        
-        elif key == ord('-'):
-            new_size = self.canvas_manager.decrease_brush_size()
-            logger.info(f"🖌️ Brush size: {new_size}")
-        
-        elif key == ord('=') or key == ord('+'):
-            new_size = self.canvas_manager.increase_brush_size()
-            logger.info(f"🖌️ Brush size: {new_size}")
-        
-        elif ord('1') <= key <= ord('8'):
-            color_index = key - ord('1')
-            if self.canvas_manager.set_color(color_index):
-                logger.info(f"🎨 Color: {self.canvas_manager.get_current_color_name()}")
-        
-        elif key == 13:  # Enter key - complete shape
-            if self.canvas_manager.shape_start_point:
-                # Shape will be completed in main loop
-                pass
-        
+        handler = self._key_table.get(key)
+        return handler() if handler else False
+    
+    def _on_quit(self) -> bool:
+        """Quit the application."""
+        return True
+    
+    def _on_clear(self) -> bool:
+        """Clear the canvas."""
+        self.canvas_manager.clear_canvas()
+        logger.info("🗑️ Canvas cleared!")
+        return False
+    
+    def _on_save(self) -> bool:
+        """Save the canvas to disk."""
+        saved_path = self.file_manager.save_canvas(
+            self.canvas_manager.canvas,
+            palette=self.canvas_manager.palette_lut
+        )
+        if saved_path:
+            logger.info(f"💾 Drawing saved as {saved_path}")
+        return False
+    
+    def _on_undo(self) -> bool:
+        """Undo the last canvas change."""
+        if self.canvas_manager.undo():
+            logger.info("↶ Undo")
+        return False
+    
+    def _on_redo(self) -> bool:
+        """Redo the last undone change."""
+        if self.canvas_manager.redo():
+            logger.info("↷ Redo")
+        return False
+    
+    def _on_toggle_trail(self) -> bool:
+        """Toggle the cursor trail."""
+        new_state = self.canvas_manager.toggle_trail()
+        logger.info(f"✨ Trail: {'ON' if new_state else 'OFF'}")
+        return False
+    
+    def _on_cycle_shape(self) -> bool:
+        """Switch to the next shape type."""
+        new_shape = self.canvas_manager.cycle_shape()
+        logger.info(f"🔷 Shape: {new_shape}")
+        return False
+    
+    def _on_decrease_brush(self) -> bool:
+        """Decrease the brush size."""
+        new_size = self.canvas_manager.decrease_brush_size()
+        logger.info(f"🖌️ Brush size: {new_size}")
+        return False
+    
+    def _on_increase_brush(self) -> bool:
+        """Increase the brush size."""
+        new_size = self.canvas_manager.increase_brush_size()
+        logger.info(f"🖌️ Brush size: {new_size}")
+        return False
+    
+    def _on_set_color(self, color_index: int) -> bool:
+        """Select a palette color by index."""
+        if self.canvas_manager.set_color(color_index):
+            logger.info(f"🎨 Color: {self.canvas_manager.get_current_color_name()}")
+        return False
+    
+    def _on_complete_shape(self) -> bool:
+        """Complete the shape in progress at the cursor."""
+        if self._last_gesture == GestureRecognizer.GESTURE_SHAPE_MODE:
+            x, y = self._last_positions['index']
+            if self.canvas_manager.complete_shape(x, y):
+                logger.info(f"✅ {self.canvas_manager.current_shape} drawn!")
         return False
     
     def _process_frame(
@@ -193,6 +296,44 @@ class SmartBoard:
             if gesture != GestureRecognizer.GESTURE_SHAPE_MODE:
                 self.canvas_manager.cancel_shape()
     
+    def _draw_static_ui(self, image: np.ndarray) -> None:
+        """
+        Draw the UI elements that never change: the color palette boxes
+        and the instructions.
+        
+        Args:
+            image: Image to draw on.
+        """
+        self.ui_renderer.draw_color_palette(image, -1)
+        self.ui_renderer.draw_instructions(image)
+    
+    def _draw_hud(self, image: np.ndarray, gesture: str, history_count: int) -> None:
+        """
+        Draw the status panel (without the position and FPS lines) and the
+        palette selection.
+        
+        Args:
+            image: Image to draw on.
+            gesture: Current gesture.
+            history_count: Number of items in history.
+        """
+        self.ui_renderer.draw_status_panel(
+            image,
+            gesture=gesture,
+            current_color=self.canvas_manager.current_color,
+            color_name=self.canvas_manager.get_current_color_name(),
+            brush_thickness=self.canvas_manager.brush_thickness,
+            current_shape=self.canvas_manager.current_shape,
+            position=None,
+            fps=None,
+            history_count=history_count
+        )
+        
+        self.ui_renderer.draw_palette_selection(
+            image,
+            self.canvas_manager.current_color_index
+        )
+    
     def _render_frame(
         self,
         frame: np.ndarray,
@@ -203,42 +344,62 @@ class SmartBoard:
         Render all UI elements on the frame.
         
         Args:
-            frame: Camera frame.
+            frame: Camera frame; it is overwritten with the rendered frame.
             gesture: Current gesture.
             positions: Cursor positions.
             
         Returns:
             Rendered frame.
         """
-        # Blend canvas with frame
+        # Blend canvas with frame in place (the frame is not needed after
+        # rendering), reading the canvas only where something has been drawn
+        # and skipping the status panel, which is drawn over it below
         combined = self.ui_renderer.blend_canvas_with_frame(
             frame,
             self.canvas_manager.canvas,
-            CANVAS_BLEND_ALPHA
+            CANVAS_BLEND_ALPHA,
+            dst=frame,
+            ink_bbox=self.canvas_manager.ink_bbox or (0, 0, 0, 0),
+            palette=self.canvas_manager.palette_lut,
+            occluded=self.ui_renderer.panel_rect
         )
         
-        # Draw status panel
-        history_count, _ = self.canvas_manager.get_history_info()
-        self.ui_renderer.draw_status_panel(
-            combined,
-            gesture=gesture,
-            current_color=self.canvas_manager.current_color,
-            color_name=self.canvas_manager.get_current_color_name(),
-            brush_thickness=self.canvas_manager.brush_thickness,
-            current_shape=self.canvas_manager.current_shape,
-            position=positions['index'],
-            fps=self._current_fps,
-            history_count=history_count
-        )
+        # The static UI is rendered once per frame size
+        if combined.shape != self._static_shape:
+            self._static_overlay = self.ui_renderer.render_overlay(
+                combined.shape, self._draw_static_ui
+            )
+            self._static_shape = combined.shape
+        self.ui_renderer.draw_overlay(combined, self._static_overlay)
         
-        # Draw color palette
-        self.ui_renderer.draw_color_palette(
-            combined,
-            self.canvas_manager.current_color_index
+        # The status panel and palette selection only change with this
+        # state, so they are composited from an overlay rendered for it.
+        # The cursor position and FPS change far more often and are drawn
+        # live.
+        history_count, _ = self.canvas_manager.get_history_info()
+        ui_state = (
+            gesture,
+            self.canvas_manager.current_color_index,
+            self.canvas_manager.brush_thickness,
+            self.canvas_manager.current_shape,
+            history_count,
+            combined.shape
         )
+        try:
+            hud_overlay = self._hud_cache[ui_state]
+            self._hud_cache.move_to_end(ui_state)
+        except KeyError:
+            hud_overlay = self.ui_renderer.render_overlay(
+                combined.shape,
+                partial(self._draw_hud, gesture=gesture, history_count=history_count)
+            )
+            self._hud_cache[ui_state] = hud_overlay
+            if len(self._hud_cache) > _HUD_CACHE_SIZE:
+                self._hud_cache.popitem(last=False)
         
-        # Draw instructions
-        self.ui_renderer.draw_instructions(combined)
+        self.ui_renderer.draw_overlay(combined, hud_overlay)
+        self.ui_renderer.draw_position_text(combined, positions['index'])
+        self.ui_renderer.draw_fps_text(combined, self._current_fps)
         
         # Draw cursor/eraser indicator based on gesture
         if gesture == GestureRecognizer.GESTURE_PALM_ERASE:
@@ -248,7 +409,7 @@ class SmartBoard:
                 self.canvas_manager.eraser_thickness
             )
         else:
-            trail_points = list(self.canvas_manager.trail_points) if self.canvas_manager.show_trail else None
+            trail_points = self.canvas_manager.get_trail_points() if self.canvas_manager.show_trail else None
             self.ui_renderer.draw_cursor(
                 combined,
                 positions['index'],
@@ -303,20 +464,38 @@ class SmartBoard:
                 
                 height, width = frame.shape[:2]
                 
-                # Process hand detection
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = self.gesture_recognizer.process_frame(rgb_frame)
+                # Collect the landmarks of a finished inference job and start
+                # a new one on the current frame. Until a job finishes, the
+                # previous landmarks are reused, so the overlay lags the
+                # camera by at most one inference.
+                results = None
+                job = self._inference_job
+                if job is not None and job.done():
+                    self._inference_job = None
+                    results = job.result()
                 
-                # Default values
-                current_gesture = GestureRecognizer.GESTURE_NONE
-                positions = {'index': (0, 0), 'palm': (0, 0)}
+                if self._inference_job is None:
+                    # Landmarks are normalized, so they map straight back
+                    # onto the full-resolution frame
+                    small_shape = self._inference_shape(height, width)
+                    if self._small_buf.shape != small_shape:
+                        self._small_buf = np.empty(small_shape, dtype=np.uint8)
+                        self._rgb_buf = np.empty_like(self._small_buf)
+                    cv2.resize(frame, small_shape[1::-1], dst=self._small_buf,
+                               interpolation=cv2.INTER_AREA)
+                    cv2.cvtColor(self._small_buf, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+                    self._inference_job = self._inference_pool.submit(
+                        self.gesture_recognizer.process_frame, self._rgb_buf
+                    )
                 
-                # Process hand landmarks if detected
-                if results.multi_hand_landmarks:
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        # Draw hand landmarks
-                        self.gesture_recognizer.draw_hand_landmarks(frame, hand_landmarks)
-                        
+                # Gesture state only advances on new results, so smoothing
+                # and gesture confirmation still count inferences, not frames
+                if results is not None:
+                    self._last_landmarks = results.multi_hand_landmarks or []
+                    self._last_gesture = GestureRecognizer.GESTURE_NONE
+                    self._last_positions = {'index': (0, 0), 'palm': (0, 0)}
+                    
+                    for hand_landmarks in self._last_landmarks:
                         # Get finger positions
                         positions = self.gesture_recognizer.get_finger_positions(
                             (height, width),
@@ -336,12 +515,24 @@ class SmartBoard:
                         
                         # Process gesture actions
                         self._process_frame(frame, positions, current_gesture)
+                        
+                        self._last_gesture = current_gesture
+                        self._last_positions = positions
+                
+                current_gesture = self._last_gesture
+                positions = self._last_positions
                 
-                # Check for shape completion via Enter key
-                key = cv2.waitKey(1) & 0xFF
-                if key == 13 and current_gesture == GestureRecognizer.GESTURE_SHAPE_MODE:
-                    if self.canvas_manager.complete_shape(positions['index'][0], positions['index'][1]):
-                        logger.info(f"✅ {self.canvas_manager.current_shape} drawn!")
+                # Draw hand landmarks
+                if DRAW_LANDMARKS:
+                    for hand_landmarks in self._last_landmarks:
+                        self.gesture_recognizer.draw_hand_landmarks(frame, hand_landmarks)
+                
+                # Poll the keyboard once per frame; unlike waitKey(1), pollKey
+                # does not sleep when no key is pending
+                key = cv2.pollKey() & 0xFF
+                if key != 255:  # 255 = no key pressed
+                    if self._handle_keyboard_input(key):
+                        break
                 
                 # Render frame with UI
                 combined_frame = self._render_frame(frame, current_gesture, positions)
@@ -350,17 +541,15 @@ class SmartBoard:
                 self._update_fps()
                 
                 # Auto-save check
-                saved_file = self.file_manager.auto_save_canvas(self.canvas_manager.canvas)
+                saved_file = self.file_manager.auto_save_canvas(
+                    self.canvas_manager.canvas,
+                    self.canvas_manager.palette_lut
+                )
                 if saved_file:
-                    logger.info(f"📁 Auto-saved: {saved_file}")
+                    logger.debug(f"📁 Auto-save queued: {saved_file}")
                 
                 # Display frame
                 cv2.imshow('SmartBoard - Finger Writing System', combined_frame)
-                
-                # Handle keyboard input
-                if key != 255 and key != 13:  # Not waiting and not Enter
-                    if self._handle_keyboard_input(key):
-                        break
         
         except KeyboardInterrupt:
             logger.info("Interrupted by user")
@@ -378,9 +567,16 @@ class SmartBoard:
         if self.camera:
             self.camera.release()
         
+        # Let any running inference finish before closing the tracker
+        if self._inference_pool:
+            self._inference_pool.shutdown(wait=True)
+        
         if self.gesture_recognizer:
             self.gesture_recognizer.close()
         
+        if self.file_manager:
+            self.file_manager.close()
+        
         cv2.destroyAllWindows()
         logger.info("🏁 SmartBoard shutdown complete")
 
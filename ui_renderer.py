@@ -6,12 +6,16 @@ color palette, instructions, and visual feedback.
 """
 
 import math
-from typing import Tuple, Dict, Optional
+import logging
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Tuple, Dict, List, Optional
 import cv2
 import numpy as np
 
 from config import (
     COLORS,
+    COLOR_NAMES,
+    COLOR_LIST,
     UI_PANEL_COLOR,
     UI_PANEL_POSITION,
     UI_TEXT_COLOR,
@@ -22,23 +26,145 @@ from config import (
     CROSSHAIR_THICKNESS,
     CURSOR_CIRCLE_RADIUS,
     MAX_HISTORY_SIZE,
-    CANVAS_BLEND_ALPHA
+    CANVAS_BLEND_ALPHA,
+    USE_OPENCL
 )
 
+logger = logging.getLogger(__name__)
+
+# All UI text uses one font
+_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_TEXT_CACHE_SIZE = 256  # Rendered strings kept for reuse
+
+# Status panel text rows: (baseline y from the panel top, font scale,
+# thickness). Rows keep their slot when hidden, so the lines drawn live
+# on top of the cached panel never move.
+_PANEL_TEXT_X = 10
+_PANEL_ROWS: Dict[str, Tuple[int, float, int]] = {
+    'mode': (25, 0.6, 2),
+    'color': (50, 0.5, 2),
+    'brush': (70, 0.5, 1),
+    'shape': (90, 0.5, 1),
+    'position': (110, 0.4, 1),
+    'fps': (130, 0.4, 1),
+    'history': (150, 0.4, 1),
+}
+
+# The trail fades in at most this many steps; longer trails draw each
+# step's segments as one polyline
+_TRAIL_BANDS = 8
+
+# Color palette geometry: left edge of the first box, box size (the
+# filled rectangles include both end points) and box pitch
+_PALETTE_X = 20
+_PALETTE_BOX_WIDTH = 30
+_PALETTE_BOX_HEIGHT = 20
+_PALETTE_SPACING = 35
+
+# Instruction lines at the bottom of the frame, and the height of the
+# banner they are pre-rendered into (room for both lines' descenders)
+_INSTRUCTIONS = (
+    "GESTURES: Index=Draw | Open Palm=Erase | Peace=Shapes | Fist=Pause",
+    "CONTROLS: 1-8=Colors | -/+=Brush | Space=Shapes | Z=Undo | X=Redo | C=Clear | S=Save"
+)
+_INSTRUCTIONS_BANNER_HEIGHT = 60
+
+# Gestures that show the drawing cursor
+_CURSOR_GESTURES = frozenset(("drawing", "shape_mode"))
+
+# Arrow preview head: 20 px long, 30 degrees off the shaft
+_PREVIEW_ARROW_LENGTH: int = 20
+_PREVIEW_ARROW_COS: float = math.cos(math.pi / 6)
+_PREVIEW_ARROW_SIN: float = math.sin(math.pi / 6)
+
+
+class UIOverlay(NamedTuple):
+    """Pre-rendered UI pixels, cropped to the area they cover."""
+    x: int
+    y: int
+    image: np.ndarray  # BGR pixels
+    mask: np.ndarray   # Non-zero where the UI drew
+
 
 class UIRenderer:
     """Handles rendering of UI elements on the frame."""
     
     def __init__(self):
         """Initialize the UI renderer."""
-        self.color_names = list(COLORS.keys())
+        self.color_names: Tuple[str, ...] = COLOR_NAMES
         self.colors = COLORS
+        
+        # (x0, y0, x1, y1) the opaque status panel background covers; the
+        # filled rectangle includes both end points
+        px, py, pw, ph = UI_PANEL_POSITION
+        self.panel_rect: Tuple[int, int, int, int] = (px, py, px + pw + 1, py + ph + 1)
+        
+        # Rasterized strings, (text, scale, thickness) -> (mask, dx, dy)
+        # where (dx, dy) is the text origin within the mask. Least recently
+        # used entries are evicted first.
+        self._text_cache: OrderedDict = OrderedDict()
+        
+        # Status panel image and the values it was rendered for
+        self._panel_cache: Optional[np.ndarray] = None
+        self._panel_key: Optional[tuple] = None
+        
+        # Instructions banner and the frame size it was rendered for
+        self._instructions_banner: Optional[UIOverlay] = None
+        self._instructions_shape: Optional[Tuple[int, int]] = None
+        
+        # Rasterized cursor (crosshair and circle) and circle outlines per
+        # (radius, thickness); colors are applied when blitting
+        self._cursor_mask: Optional[Tuple[np.ndarray, int]] = None
+        self._ring_sprites: Dict[Tuple[int, int], Tuple[np.ndarray, int]] = {}
+        
+        # Last live panel lines and the values they were formatted from;
+        # the strings double as text sprite cache keys
+        self._fps_value: Optional[int] = None
+        self._fps_text: str = ""
+        self._position_value: Optional[Tuple[int, int]] = None
+        self._position_text: str = ""
+        
+        # Palette boxes as one strip: the frame columns the boxes cover and
+        # the color of each, painted over the box rows in a single
+        # assignment
+        columns = []
+        for i in range(len(COLOR_LIST)):
+            x_pos = _PALETTE_X + i * _PALETTE_SPACING
+            columns.extend(range(x_pos, x_pos + _PALETTE_BOX_WIDTH + 1))
+        self._palette_columns: np.ndarray = np.array(columns, dtype=np.intp)
+        self._palette_strip: np.ndarray = np.repeat(
+            np.array(COLOR_LIST, dtype=np.uint8), _PALETTE_BOX_WIDTH + 1, axis=0
+        )
+        
+        # Pre-rendered palettes per (selected index, y position)
+        self._palette_sprites: Dict[Tuple[int, int], Optional[UIOverlay]] = {}
+        
+        # Trail fade bands per (base color, trail length)
+        self._trail_band_cache: Dict[Tuple[Tuple[int, int, int], int], List[Tuple[int, int, Tuple[int, int, int]]]] = {}
+        
+        # Default blend output, allocated on first use
+        self._blend_out: Optional[np.ndarray] = None
+        
+        # Scratch buffer for palette canvases expanded to BGR
+        self._ink_buf: Optional[np.ndarray] = None
+        
+        # OpenCL blending: pays off on integrated GPUs, where uploads are
+        # close to free, and falls back to the CPU path otherwise
+        self._use_opencl: bool = USE_OPENCL and cv2.ocl.haveOpenCL()
+        if self._use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+        elif USE_OPENCL:
+            logger.info("OpenCL not available, blending on the CPU")
     
     def blend_canvas_with_frame(
         self,
         frame: np.ndarray,
         canvas: np.ndarray,
-        alpha: float = CANVAS_BLEND_ALPHA
+        alpha: float = CANVAS_BLEND_ALPHA,
+        dst: Optional[np.ndarray] = None,
+        ink_bbox: Optional[Tuple[int, int, int, int]] = None,
+        palette: Optional[np.ndarray] = None,
+        occluded: Optional[Tuple[int, int, int, int]] = None
     ) -> np.ndarray:
         """
         Blend the canvas with the camera frame.
@@ -47,11 +173,256 @@ class UIRenderer:
             frame: Camera frame.
             canvas: Drawing canvas.
             alpha: Blend ratio (0-1, higher = more frame).
+            dst: Output buffer, same shape as frame; may be frame itself.
+                Defaults to a buffer owned by the renderer that is reused
+                on every call.
+            ink_bbox: Region (x0, y0, x1, y1) outside of which the canvas
+                is blank; an empty region means the canvas is blank
+                everywhere. None blends the whole canvas.
+            palette: (256, 3) BGR lookup table if canvas holds palette
+                indices rather than BGR pixels.
+            occluded: Region (x0, y0, x1, y1) the caller paints over
+                opaquely afterwards. It is left unblended, and its dst
+                pixels are undefined. Only used together with ink_bbox.
             
         Returns:
-            Blended frame.
+            Blended frame (dst, except on the OpenCL path).
         """
-        return cv2.addWeighted(frame, alpha, canvas, 1 - alpha, 0)
+        height, width = frame.shape[:2]
+        
+        if dst is None:
+            if self._blend_out is None or self._blend_out.shape != frame.shape:
+                self._blend_out = np.empty_like(frame)
+            dst = self._blend_out
+        
+        if self._use_opencl:
+            # The whole frame is blended on the device; a partial blend
+            # would cost more in ROI transfers than it saves. Palette
+            # canvases are uploaded as indices (a third of the BGR size)
+            # and expanded there: with all three channels holding the
+            # index, a per-channel LUT yields the palette color.
+            if palette is None:
+                ink = cv2.UMat(canvas)
+            else:
+                ink = cv2.LUT(
+                    cv2.cvtColor(cv2.UMat(canvas), cv2.COLOR_GRAY2BGR),
+                    palette.reshape(256, 1, 3)
+                )
+            return cv2.addWeighted(cv2.UMat(frame), alpha, ink, 1 - alpha, 0).get()
+        
+        if ink_bbox is None:
+            ink = self._canvas_bgr(canvas, palette, (0, 0, width, height))
+            return cv2.addWeighted(frame, alpha, ink, 1 - alpha, 0, dst=dst)
+        
+        # Where the canvas is blank the blend reduces to scaling the frame,
+        # so the canvas only needs to be read inside the ink region. Every
+        # pixel is written at most once, which keeps dst=frame correct.
+        x0, y0, x1, y1 = ink_bbox
+        frame_rect = (0, 0, width, height)
+        if x0 >= x1 or y0 >= y1:
+            ink_rects = []
+            plain_rects = [frame_rect]
+        else:
+            ink_rects = [ink_bbox]
+            plain_rects = self._subtract_rect(frame_rect, ink_bbox)
+        
+        if occluded is not None:
+            ink_rects = [r for rect in ink_rects for r in self._subtract_rect(rect, occluded)]
+            plain_rects = [r for rect in plain_rects for r in self._subtract_rect(rect, occluded)]
+        
+        for rect in ink_rects:
+            rx0, ry0, rx1, ry1 = rect
+            ink = self._canvas_bgr(canvas, palette, rect)
+            cv2.addWeighted(frame[ry0:ry1, rx0:rx1], alpha, ink, 1 - alpha, 0,
+                            dst=dst[ry0:ry1, rx0:rx1])
+        
+        for rx0, ry0, rx1, ry1 in plain_rects:
+            cv2.convertScaleAbs(frame[ry0:ry1, rx0:rx1], dst=dst[ry0:ry1, rx0:rx1], alpha=alpha)
+        return dst
+    
+    @staticmethod
+    def _subtract_rect(
+        rect: Tuple[int, int, int, int],
+        hole: Tuple[int, int, int, int]
+    ) -> List[Tuple[int, int, int, int]]:
+        """
+        Split the part of a rectangle outside another into rectangles.
+        
+        Args:
+            rect: (x0, y0, x1, y1) rectangle to split.
+            hole: (x0, y0, x1, y1) rectangle to leave out.
+            
+        Returns:
+            Up to four non-empty rectangles: the bands above and below the
+            hole, then its sides.
+        """
+        x0, y0, x1, y1 = rect
+        hx0, hy0 = max(hole[0], x0), max(hole[1], y0)
+        hx1, hy1 = min(hole[2], x1), min(hole[3], y1)
+        if hx0 >= hx1 or hy0 >= hy1:
+            return [rect] if x0 < x1 and y0 < y1 else []
+        
+        parts = (
+            (x0, y0, x1, hy0),
+            (x0, hy1, x1, y1),
+            (x0, hy0, hx0, hy1),
+            (hx1, hy0, x1, hy1)
+        )
+        return [p for p in parts if p[0] < p[2] and p[1] < p[3]]
+    
+    def _canvas_bgr(
+        self,
+        canvas: np.ndarray,
+        palette: Optional[np.ndarray],
+        region: Tuple[int, int, int, int]
+    ) -> np.ndarray:
+        """
+        Get the BGR pixels of a canvas region.
+        
+        Args:
+            canvas: Drawing canvas, BGR or palette indices.
+            palette: (256, 3) BGR lookup table for palette canvases.
+            region: (x0, y0, x1, y1) region to return.
+            
+        Returns:
+            BGR view of the region, valid until the next call.
+        """
+        x0, y0, x1, y1 = region
+        if palette is None:
+            return canvas[y0:y1, x0:x1]
+        
+        # Expand into a reused buffer; mode='clip' avoids the extra copy
+        # np.take makes for 'raise', and uint8 indices are always in range
+        size = (y1 - y0) * (x1 - x0) * 3
+        if self._ink_buf is None or self._ink_buf.size < size:
+            self._ink_buf = np.empty(canvas.shape[0] * canvas.shape[1] * 3, dtype=np.uint8)
+        ink = self._ink_buf[:size].reshape(y1 - y0, x1 - x0, 3)
+        np.take(palette, canvas[y0:y1, x0:x1], axis=0, out=ink, mode='clip')
+        return ink
+    
+    def _text_sprite(self, text: str, scale: float, thickness: int) -> Tuple[np.ndarray, int, int]:
+        """
+        Get the rasterized pixels of a string, rendering it on first use.
+        
+        Args:
+            text: Text to render.
+            scale: Font scale.
+            thickness: Stroke thickness.
+            
+        Returns:
+            Tuple of (boolean mask of text pixels, origin x, origin y).
+        """
+        key = (text, scale, thickness)
+        sprite = self._text_cache.get(key)
+        if sprite is not None:
+            self._text_cache.move_to_end(key)
+            return sprite
+        
+        # Render with generous padding, since some glyphs reach outside the
+        # box getTextSize reports, then crop to the pixels actually drawn.
+        # Sprites are boolean masks, so glyphs are rasterized without
+        # anti-aliasing whatever their size.
+        (w, h), baseline = cv2.getTextSize(text, _FONT, scale, thickness)
+        pad = h + thickness
+        img = np.zeros((h + baseline + 2 * pad, w + 2 * pad), dtype=np.uint8)
+        cv2.putText(img, text, (pad, pad + h), _FONT, scale, 255, thickness, cv2.LINE_8)
+        
+        x0, y0, cw, ch = cv2.boundingRect(img)
+        sprite = (img[y0:y0 + ch, x0:x0 + cw] > 0, pad - x0, pad + h - y0)
+        
+        self._text_cache[key] = sprite
+        if len(self._text_cache) > _TEXT_CACHE_SIZE:
+            self._text_cache.popitem(last=False)
+        return sprite
+    
+    def _put_text(
+        self,
+        frame: np.ndarray,
+        text: str,
+        org: Tuple[int, int],
+        scale: float,
+        color: Tuple[int, int, int],
+        thickness: int
+    ) -> None:
+        """
+        Draw text like cv2.putText, copying cached glyph pixels.
+        
+        Args:
+            frame: Frame to draw on.
+            text: Text to draw.
+            org: Bottom-left corner of the text.
+            scale: Font scale.
+            color: Text color (BGR).
+            thickness: Stroke thickness.
+        """
+        mask, dx, dy = self._text_sprite(text, scale, thickness)
+        self._blit_mask(frame, mask, org[0] - dx, org[1] - dy, color)
+    
+    @staticmethod
+    def _blit_mask(
+        frame: np.ndarray,
+        mask: np.ndarray,
+        x0: int,
+        y0: int,
+        color: Tuple[int, int, int]
+    ) -> None:
+        """
+        Paint the pixels of a boolean mask in one color, clipped to the frame.
+        
+        Args:
+            frame: Frame to draw on.
+            mask: Boolean mask of the pixels to paint.
+            x0, y0: Frame position of the mask's top-left corner.
+            color: Color to paint (BGR).
+        """
+        h, w = mask.shape
+        
+        # Clip to the frame
+        fx0, fy0 = max(x0, 0), max(y0, 0)
+        fx1, fy1 = min(x0 + w, frame.shape[1]), min(y0 + h, frame.shape[0])
+        if fx0 >= fx1 or fy0 >= fy1:
+            return
+        
+        frame[fy0:fy1, fx0:fx1][mask[fy0 - y0:fy1 - y0, fx0 - x0:fx1 - x0]] = color
+    
+    def _cursor_sprite(self) -> Tuple[np.ndarray, int]:
+        """
+        Get the rasterized crosshair and circle of the cursor.
+        
+        Returns:
+            Tuple of (boolean mask centered on the cursor, its half-size).
+        """
+        if self._cursor_mask is None:
+            r = max(CROSSHAIR_SIZE, CURSOR_CIRCLE_RADIUS) + CROSSHAIR_THICKNESS
+            img = np.zeros((2 * r + 1, 2 * r + 1), dtype=np.uint8)
+            cv2.polylines(img, np.array((
+                ((r - CROSSHAIR_SIZE, r), (r + CROSSHAIR_SIZE, r)),
+                ((r, r - CROSSHAIR_SIZE), (r, r + CROSSHAIR_SIZE))
+            ), dtype=np.int32), False, 255, CROSSHAIR_THICKNESS)
+            cv2.circle(img, (r, r), CURSOR_CIRCLE_RADIUS, 255, CROSSHAIR_THICKNESS)
+            self._cursor_mask = (img > 0, r)
+        return self._cursor_mask
+    
+    def _ring_sprite(self, radius: int, thickness: int) -> Tuple[np.ndarray, int]:
+        """
+        Get a rasterized circle outline, rendering it on first use.
+        
+        Args:
+            radius: Circle radius.
+            thickness: Outline thickness.
+            
+        Returns:
+            Tuple of (boolean mask centered on the circle, its half-size).
+        """
+        key = (radius, thickness)
+        sprite = self._ring_sprites.get(key)
+        if sprite is None:
+            r = radius + thickness
+            img = np.zeros((2 * r + 1, 2 * r + 1), dtype=np.uint8)
+            cv2.circle(img, (r, r), radius, 255, thickness)
+            sprite = (img > 0, r)
+            self._ring_sprites[key] = sprite
+        return sprite
     
     def draw_status_panel(
         self,
@@ -61,8 +432,8 @@ class UIRenderer:
         color_name: str,
         brush_thickness: int,
         current_shape: str,
-        position: Tuple[int, int],
-        fps: int,
+        position: Optional[Tuple[int, int]],
+        fps: Optional[int],
         history_count: int
     ) -> None:
         """
@@ -75,46 +446,193 @@ class UIRenderer:
             color_name: Name of current color.
             brush_thickness: Current brush size.
             current_shape: Current shape type (if in shape mode).
-            position: Current cursor (x, y) position.
-            fps: Current FPS.
+            position: Current cursor (x, y) position, or None to leave
+                the position line out (see draw_position_text()).
+            fps: Current FPS, or None to leave the FPS line out (see
+                draw_fps_text()).
             history_count: Number of items in history.
         """
         x, y, w, h = UI_PANEL_POSITION
         
-        # Draw panel background
-        cv2.rectangle(frame, (x, y), (x + w, y + h), UI_PANEL_COLOR, -1)
+        # Background and the slow-changing lines are rendered into a cached
+        # panel image, rebuilt only when one of them changes
+        key = (gesture, current_color, color_name, brush_thickness, current_shape, history_count)
+        if key != self._panel_key:
+            self._panel_cache = self._render_panel(
+                gesture, current_color, color_name, brush_thickness,
+                current_shape, history_count
+            )
+            self._panel_key = key
+        
+        # The filled rectangle covers both end points, hence the +1
+        x1 = min(x + w + 1, frame.shape[1])
+        y1 = min(y + h + 1, frame.shape[0])
+        if x < x1 and y < y1:
+            frame[y:y1, x:x1] = self._panel_cache[:y1 - y, :x1 - x]
+        
+        # Position and FPS
+        if position is not None:
+            self.draw_position_text(frame, position)
+        
+        if fps is not None:
+            self.draw_fps_text(frame, fps)
+    
+    def _put_panel_row(
+        self,
+        image: np.ndarray,
+        row: str,
+        text: str,
+        color: Tuple[int, int, int],
+        x: int = 0,
+        y: int = 0
+    ) -> None:
+        """
+        Draw one status panel line in its row's slot.
+        
+        Args:
+            image: Image to draw on.
+            row: Key into _PANEL_ROWS.
+            text: Line text.
+            color: Text color (BGR).
+            x, y: Top-left corner of the panel within image.
+        """
+        dy, scale, thickness = _PANEL_ROWS[row]
+        self._put_text(image, text, (x + _PANEL_TEXT_X, y + dy), scale, color, thickness)
+    
+    def _render_panel(
+        self,
+        gesture: str,
+        current_color: Tuple[int, int, int],
+        color_name: str,
+        brush_thickness: int,
+        current_shape: str,
+        history_count: int
+    ) -> np.ndarray:
+        """
+        Render the status panel background and its slow-changing lines.
+        
+        Args:
+            gesture: Current gesture name.
+            current_color: Current drawing color (BGR).
+            color_name: Name of current color.
+            brush_thickness: Current brush size.
+            current_shape: Current shape type (if in shape mode).
+            history_count: Number of items in history.
+            
+        Returns:
+            Panel image, in panel coordinates.
+        """
+        _, _, w, h = UI_PANEL_POSITION
+        
+        # Panel background
+        panel = np.empty((h + 1, w + 1, 3), dtype=np.uint8)
+        panel[:] = UI_PANEL_COLOR
         
         # Get gesture display text (pre-computed for efficiency)
         gesture_text = GESTURE_DISPLAY_NAMES.get(gesture, gesture.upper())
-        mode_text = f"Mode: {gesture_text}"
         mode_color = GESTURE_COLORS.get(gesture, UI_TEXT_COLOR)
         
+        rows = [
+            ('mode', f"Mode: {gesture_text}", mode_color),
+            ('color', f"Color: {color_name.upper()}", current_color),
+            ('brush', f"Brush Size: {brush_thickness}", UI_TEXT_COLOR),
+            ('history', f"History: {history_count}/{MAX_HISTORY_SIZE}", UI_SECONDARY_TEXT_COLOR),
+        ]
+        
+        # Shape info (only in shape mode)
+        if gesture == "shape_mode":
+            rows.append(('shape', f"Shape: {current_shape.upper()}", (255, 255, 0)))
+        
         # Draw status text
-        cv2.putText(frame, mode_text, (x + 10, y + 25), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, mode_color, 2)
+        for row, text, color in rows:
+            self._put_panel_row(panel, row, text, color)
+        
+        return panel
+    
+    def draw_position_text(self, frame: np.ndarray, position: Tuple[int, int]) -> None:
+        """
+        Draw the cursor position line of the status panel.
+        
+        Args:
+            frame: Frame to draw on.
+            position: Current cursor (x, y) position.
+        """
+        x, y = UI_PANEL_POSITION[:2]
+        if position != self._position_value:
+            self._position_text = "Position: (%d, %d)" % position
+            self._position_value = position
+        self._put_panel_row(frame, 'position', self._position_text,
+                            UI_SECONDARY_TEXT_COLOR, x, y)
+    
+    def draw_fps_text(self, frame: np.ndarray, fps: int) -> None:
+        """
+        Draw the FPS line of the status panel.
         
-        cv2.putText(frame, f"Color: {color_name.upper()}", (x + 10, y + 50),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, current_color, 2)
+        Args:
+            frame: Frame to draw on.
+            fps: Current FPS.
+        """
+        x, y = UI_PANEL_POSITION[:2]
+        if fps != self._fps_value:
+            self._fps_text = "FPS: %d" % fps
+            self._fps_value = fps
+        self._put_panel_row(frame, 'fps', self._fps_text, UI_SECONDARY_TEXT_COLOR, x, y)
+    
+    def render_overlay(
+        self,
+        shape: Tuple[int, ...],
+        draw: Callable[[np.ndarray], None]
+    ) -> Optional[UIOverlay]:
+        """
+        Pre-render UI elements so they can be composited onto later frames.
         
-        cv2.putText(frame, f"Brush Size: {brush_thickness}", (x + 10, y + 70),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, UI_TEXT_COLOR, 1)
+        The draw callback runs on a black and on a white image; pixels that
+        differ from the background in either one are the ones the UI covers.
+        This is exact because the UI is drawn without anti-aliasing.
         
-        # Shape info (only in shape mode)
-        if gesture == "shape_mode":
-            cv2.putText(frame, f"Shape: {current_shape.upper()}", (x + 10, y + 90),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+        Args:
+            shape: Shape of the frames the overlay will be composited onto.
+            draw: Callback drawing the UI elements onto the image it is given.
+            
+        Returns:
+            The overlay, or None if nothing was drawn.
+        """
+        on_black = np.zeros(shape, dtype=np.uint8)
+        on_white = np.full(shape, 255, dtype=np.uint8)
+        draw(on_black)
+        draw(on_white)
+        
+        mask = ((on_black != 0).any(axis=2) | (on_white != 255).any(axis=2)).astype(np.uint8)
+        x, y, w, h = cv2.boundingRect(mask)
+        if w == 0 or h == 0:
+            return None
+        
+        return UIOverlay(
+            x, y,
+            on_black[y:y + h, x:x + w].copy(),
+            mask[y:y + h, x:x + w].copy()
+        )
+    
+    def draw_overlay(self, frame: np.ndarray, overlay: Optional[UIOverlay]) -> None:
+        """
+        Composite a pre-rendered overlay onto the frame.
         
-        # Position and FPS
-        pos_x, pos_y = position
-        cv2.putText(frame, f"Position: ({pos_x}, {pos_y})", (x + 10, y + 110),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, UI_SECONDARY_TEXT_COLOR, 1)
+        Args:
+            frame: Frame to draw on.
+            overlay: Overlay from render_overlay().
+        """
+        if overlay is None:
+            return
         
-        cv2.putText(frame, f"FPS: {fps}", (x + 10, y + 130),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, UI_SECONDARY_TEXT_COLOR, 1)
+        # Clip to the frame
+        h, w = overlay.mask.shape
+        h = min(h, frame.shape[0] - overlay.y)
+        w = min(w, frame.shape[1] - overlay.x)
+        if h <= 0 or w <= 0:
+            return
         
-        # History info
-        cv2.putText(frame, f"History: {history_count}/{MAX_HISTORY_SIZE}", (x + 10, y + 150),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, UI_SECONDARY_TEXT_COLOR, 1)
+        roi = frame[overlay.y:overlay.y + h, overlay.x:overlay.x + w]
+        cv2.copyTo(overlay.image[:h, :w], overlay.mask[:h, :w], roi)
     
     def draw_color_palette(
         self,
@@ -127,25 +645,68 @@ class UIRenderer:
         
         Args:
             frame: Frame to draw on.
-            current_color_index: Index of currently selected color.
+            current_color_index: Index of currently selected color,
+                or -1 to draw the palette without a selection.
             y_position: Y position for the palette.
         """
-        x_start = 20
-        box_size = 30
-        spacing = 35
+        # Palettes are pre-rendered once per selection and composited,
+        # so the camera stays visible between the boxes
+        key = (current_color_index, y_position)
+        if key not in self._palette_sprites:
+            extent = (
+                y_position + 30,
+                _PALETTE_X + len(COLOR_LIST) * _PALETTE_SPACING + 10,
+                3
+            )
+            self._palette_sprites[key] = self.render_overlay(
+                extent,
+                lambda image: self._draw_palette_boxes(image, current_color_index, y_position)
+            )
+        self.draw_overlay(frame, self._palette_sprites[key])
+    
+    def _draw_palette_boxes(
+        self,
+        frame: np.ndarray,
+        current_color_index: int,
+        y_position: int
+    ) -> None:
+        """
+        Draw the color palette boxes and selection indicator directly.
         
-        for i, (name, color) in enumerate(self.colors.items()):
-            x_pos = x_start + i * spacing
-            
-            # Color box
-            cv2.rectangle(frame, (x_pos, y_position), 
-                         (x_pos + box_size, y_position + 20), color, -1)
-            
-            # Selection indicator
-            if i == current_color_index:
-                cv2.rectangle(frame, (x_pos - 2, y_position - 2),
-                             (x_pos + box_size + 2, y_position + 22), 
-                             UI_TEXT_COLOR, 2)
+        Args:
+            frame: Frame to draw on.
+            current_color_index: Index of currently selected color, or -1.
+            y_position: Y position for the palette.
+        """
+        # Color boxes, all at once from the strip, clipped to the frame
+        y0 = max(y_position, 0)
+        y1 = min(y_position + _PALETTE_BOX_HEIGHT + 1, frame.shape[0])
+        n = int(np.searchsorted(self._palette_columns, frame.shape[1]))
+        if y0 < y1 and n:
+            frame[y0:y1, self._palette_columns[:n]] = self._palette_strip[:n]
+        
+        # Selection indicator
+        if current_color_index >= 0:
+            self.draw_palette_selection(frame, current_color_index, y_position)
+    
+    def draw_palette_selection(
+        self,
+        frame: np.ndarray,
+        current_color_index: int,
+        y_position: int = 200
+    ) -> None:
+        """
+        Draw the selection indicator around a color palette box.
+        
+        Args:
+            frame: Frame to draw on.
+            current_color_index: Index of currently selected color.
+            y_position: Y position of the palette.
+        """
+        x_pos = _PALETTE_X + current_color_index * _PALETTE_SPACING
+        cv2.rectangle(frame, (x_pos - 2, y_position - 2),
+                     (x_pos + _PALETTE_BOX_WIDTH + 2, y_position + _PALETTE_BOX_HEIGHT + 2),
+                     UI_TEXT_COLOR, 2)
     
     def draw_instructions(self, frame: np.ndarray) -> None:
         """
@@ -154,23 +715,38 @@ class UIRenderer:
         Args:
             frame: Frame to draw on.
         """
-        height = frame.shape[0]
-        
-        instructions = [
-            "GESTURES: Index=Draw | Open Palm=Erase | Peace=Shapes | Fist=Pause",
-            "CONTROLS: 1-8=Colors | -/+=Brush | Space=Shapes | Z=Undo | X=Redo | C=Clear | S=Save"
-        ]
+        # The banner is pre-rendered once per frame size and composited
+        shape = frame.shape[:2]
+        if shape != self._instructions_shape:
+            height, width = shape
+            top = max(height - _INSTRUCTIONS_BANNER_HEIGHT, 0)
+            banner = self.render_overlay(
+                (height - top, width, 3),
+                lambda image: self._draw_instruction_lines(image, height - top)
+            )
+            self._instructions_banner = banner._replace(y=banner.y + top) if banner else None
+            self._instructions_shape = shape
+        self.draw_overlay(frame, self._instructions_banner)
+    
+    def _draw_instruction_lines(self, image: np.ndarray, y_offset: int) -> None:
+        """
+        Draw the instruction lines directly.
         
-        for i, instruction in enumerate(instructions):
-            cv2.putText(frame, instruction, (10, height - 40 + i * 20),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.45, UI_SECONDARY_TEXT_COLOR, 1)
+        Args:
+            image: Image to draw on.
+            y_offset: The frame height in image coordinates; the lines sit
+                40 and 20 rows above it.
+        """
+        for i, instruction in enumerate(_INSTRUCTIONS):
+            self._put_text(image, instruction, (10, y_offset - 40 + i * 20),
+                          0.45, UI_SECONDARY_TEXT_COLOR, 1)
     
     def draw_cursor(
         self,
         frame: np.ndarray,
         position: Tuple[int, int],
         gesture: str,
-        trail_points: Optional[list] = None
+        trail_points: Optional[np.ndarray] = None
     ) -> None:
         """
         Draw cursor and trail visualization.
@@ -179,31 +755,28 @@ class UIRenderer:
             frame: Frame to draw on.
             position: Cursor (x, y) position.
             gesture: Current gesture.
-            trail_points: List of recent trail points.
+            trail_points: (N, 2) array of recent trail points, oldest first.
         """
         x, y = position
         
         if x <= 0 or y <= 0:
             return
         
-        if gesture in ["drawing", "shape_mode"]:
+        if gesture in _CURSOR_GESTURES:
             color = GESTURE_COLORS.get(gesture, (0, 255, 0))
             
-            # Draw crosshair
-            cv2.line(frame, (x - CROSSHAIR_SIZE, y), (x + CROSSHAIR_SIZE, y), 
-                    color, CROSSHAIR_THICKNESS)
-            cv2.line(frame, (x, y - CROSSHAIR_SIZE), (x, y + CROSSHAIR_SIZE), 
-                    color, CROSSHAIR_THICKNESS)
-            cv2.circle(frame, (x, y), CURSOR_CIRCLE_RADIUS, color, CROSSHAIR_THICKNESS)
+            # Draw crosshair and circle from the pre-rasterized sprite
+            mask, r = self._cursor_sprite()
+            self._blit_mask(frame, mask, x - r, y - r, color)
             
             # Draw trail
-            if trail_points and len(trail_points) > 1:
+            if trail_points is not None and len(trail_points) > 1:
                 self._draw_trail(frame, trail_points, color)
     
     def _draw_trail(
         self,
         frame: np.ndarray,
-        trail_points: list,
+        trail_points: np.ndarray,
         color: Tuple[int, int, int]
     ) -> None:
         """
@@ -211,15 +784,55 @@ class UIRenderer:
         
         Args:
             frame: Frame to draw on.
-            trail_points: List of trail points.
+            trail_points: (N, 2) array of trail points, oldest first.
             color: Base color for the trail.
         """
-        for i in range(1, len(trail_points)):
-            alpha = i / len(trail_points)
-            pt1 = trail_points[i - 1]
-            pt2 = trail_points[i]
-            trail_color = tuple(int(c * alpha) for c in color)
-            cv2.line(frame, pt1, pt2, trail_color, 2)
+        # Unbox to Python ints once for the comparisons below
+        points = trail_points.tolist()
+        last = len(points) - 1
+        for start, stop, band_color in self._trail_bands(color, len(points)):
+            # While the fingertip rests, the band and the start of the next
+            # one repeat a single point; the newer (brighter) band covers
+            # exactly the same pixels
+            if stop < last and all(p == points[start] for p in points[start + 1:stop + 2]):
+                continue
+            if stop - start == 1:
+                cv2.line(frame, points[start], points[stop], band_color, 2)
+            else:
+                cv2.polylines(frame, [trail_points[start:stop + 1]], False, band_color, 2)
+    
+    def _trail_bands(
+        self,
+        color: Tuple[int, int, int],
+        n: int
+    ) -> List[Tuple[int, int, Tuple[int, int, int]]]:
+        """
+        Split an n-point trail into fade bands of one color each, oldest first.
+        
+        Trails of up to _TRAIL_BANDS segments get one band per segment;
+        longer ones share a band's color, that of its newest segment.
+        
+        Args:
+            color: Base color for the trail.
+            n: Number of trail points.
+            
+        Returns:
+            (first point, last point, color) per band, fading in towards
+            the newest one.
+        """
+        key = (color, n)
+        bands = self._trail_band_cache.get(key)
+        if bands is None:
+            bands = []
+            segments = n - 1
+            start = 0
+            for i in range(segments):
+                # Close the band at its last segment
+                if i == segments - 1 or (i + 1) * _TRAIL_BANDS // segments != i * _TRAIL_BANDS // segments:
+                    bands.append((start, i + 1, tuple(int(c * (i + 1) / n) for c in color)))
+                    start = i + 1
+            self._trail_band_cache[key] = bands
+        return bands
     
     def draw_eraser_indicator(
         self,
@@ -237,12 +850,13 @@ class UIRenderer:
         """
         x, y = position
         
-        # Draw eraser circle
-        cv2.circle(frame, (x, y), eraser_size, (0, 0, 255), 3)
+        # Draw eraser circle from the pre-rasterized sprite
+        mask, r = self._ring_sprite(eraser_size, 3)
+        self._blit_mask(frame, mask, x - r, y - r, (0, 0, 255))
         
         # Draw "ERASING" label
-        cv2.putText(frame, "ERASING", (x - 40, y - eraser_size - 10),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+        self._put_text(frame, "ERASING", (x - 40, y - eraser_size - 10),
+                      0.7, (0, 0, 255), 2)
     
     def draw_shape_preview(
         self,
@@ -271,9 +885,7 @@ class UIRenderer:
             cv2.rectangle(frame, start, end, color, 2)
         
         elif shape_type == 'circle':
-            radius = int(math.sqrt(
-                (end[0] - start[0])**2 + (end[1] - start[1])**2
-            ))
+            radius = int(math.hypot(end[0] - start[0], end[1] - start[1]))
             cv2.circle(frame, start, radius, color, 2)
         
         elif shape_type == 'arrow':
@@ -295,19 +907,27 @@ class UIRenderer:
             end: Arrow end point.
             color: Arrow color.
         """
-        cv2.line(frame, start, end, color, 2)
-        
-        angle = math.atan2(end[1] - start[1], end[0] - start[0])
-        arrow_length = 20
-        arrow_angle = math.pi / 6
-        
-        x1 = int(end[0] - arrow_length * math.cos(angle - arrow_angle))
-        y1 = int(end[1] - arrow_length * math.sin(angle - arrow_angle))
-        x2 = int(end[0] - arrow_length * math.cos(angle + arrow_angle))
-        y2 = int(end[1] - arrow_length * math.sin(angle + arrow_angle))
-        
-        cv2.line(frame, end, (x1, y1), color, 2)
-        cv2.line(frame, end, (x2, y2), color, 2)
+        # Unit vector of the shaft (cos/sin of its angle)
+        dx = end[0] - start[0]
+        dy = end[1] - start[1]
+        length = math.hypot(dx, dy)
+        if length:
+            c, s = dx / length, dy / length
+        else:
+            c, s = 1.0, 0.0
+        
+        # Rotate it by +/- the head angle via the angle-sum identities
+        x1 = int(end[0] - _PREVIEW_ARROW_LENGTH * (c * _PREVIEW_ARROW_COS + s * _PREVIEW_ARROW_SIN))
+        y1 = int(end[1] - _PREVIEW_ARROW_LENGTH * (s * _PREVIEW_ARROW_COS - c * _PREVIEW_ARROW_SIN))
+        x2 = int(end[0] - _PREVIEW_ARROW_LENGTH * (c * _PREVIEW_ARROW_COS - s * _PREVIEW_ARROW_SIN))
+        y2 = int(end[1] - _PREVIEW_ARROW_LENGTH * (s * _PREVIEW_ARROW_COS + c * _PREVIEW_ARROW_SIN))
+        
+        # Shaft and both head strokes in one call
+        cv2.polylines(frame, np.array((
+            (start, end),
+            (end, (x1, y1)),
+            (end, (x2, y2))
+        ), dtype=np.int32), False, color, 2)
     
     def draw_auto_save_notification(
         self,
@@ -326,5 +946,5 @@ class UIRenderer:
         height = frame.shape[0]
         
         text = f"Auto-saved: {filename}"
-        cv2.putText(frame, text, (10, height - 80),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+        self._put_text(frame, text, (10, height - 80),
+                      0.5, (0, 255, 0), 1)